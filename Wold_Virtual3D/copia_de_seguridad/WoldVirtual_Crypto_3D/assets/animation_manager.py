@@ -8,6 +8,7 @@ from dataclasses import dataclass
 import trimesh
 from trimesh.exchange.gltf import load_gltf, export_gltf
 import pygltflib
+from .metadata_store import MetadataStore, MetadataTable, open_metadata_table
 
 # Configuración de logging
 logging.basicConfig(
@@ -31,37 +32,33 @@ class AnimationMetadata:
 class AnimationManager:
     """Gestor de animaciones."""
     
-    def __init__(self, base_path: str = "assets/animations"):
+    def __init__(self,
+                 base_path: str = "assets/animations",
+                 metadata_store: Optional[MetadataStore] = None):
         self.base_path = Path(base_path)
         self.metadata_path = self.base_path / "metadata"
         self.cache_path = self.base_path / "cache"
         self.logger = logging.getLogger("AnimationManager")
+        self.metadata_store = metadata_store
         
         # Crear directorios necesarios
         self.metadata_path.mkdir(parents=True, exist_ok=True)
         self.cache_path.mkdir(parents=True, exist_ok=True)
         
         # Cargar metadatos existentes
-        self.metadata: Dict[str, AnimationMetadata] = self._load_metadata()
+        self.metadata: MetadataTable = self._load_metadata()
         
-    def _load_metadata(self) -> Dict[str, AnimationMetadata]:
-        """Carga los metadatos de animaciones desde el archivo JSON."""
-        metadata_file = self.metadata_path / "animations_metadata.json"
-        if metadata_file.exists():
-            with open(metadata_file, 'r') as f:
-                data = json.load(f)
-                return {k: AnimationMetadata(**v) for k, v in data.items()}
-        return {}
+    def _load_metadata(self) -> MetadataTable:
+        """Abre la tabla de metadatos de animaciones en el almacén compartido."""
+        return open_metadata_table(
+            self.metadata_path / "animations_metadata.json",
+            AnimationMetadata,
+            self.metadata_store
+        )
         
-    def _save_metadata(self):
-        """Guarda los metadatos de animaciones en el archivo JSON."""
-        metadata_file = self.metadata_path / "animations_metadata.json"
-        with open(metadata_file, 'w') as f:
-            json.dump(
-                {k: v.__dict__ for k, v in self.metadata.items()},
-                f,
-                indent=2
-            )
+    def _save_metadata(self, *keys: str):
+        """Persiste los metadatos de animaciones modificados."""
+        self.metadata.save(*keys)
             
     def _get_animation_info(self, file_path: Path) -> Optional[AnimationMetadata]:
         """Obtiene información detallada de una animación."""
@@ -0,0 +1,114 @@
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+class AssetIndex:
+    """Índices secundarios en memoria para búsquedas de assets.
+
+    - Índice hash por tipo.
+    - Índice invertido de tag a hashes de asset.
+    - Índice ordenado por tamaño para consultas por rango.
+
+    Las consultas eligen como conductor el candidato más pequeño y filtran
+    el resto por pertenencia, de forma perezosa.
+    """
+
+    def __init__(self):
+        self.by_type: Dict[str, Set[str]] = {}
+        self.by_tag: Dict[str, Set[str]] = {}
+        self.by_size: List[Tuple[int, str]] = []
+        self.entries: Dict[str, Tuple[str, Tuple[str, ...], int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.entries
+
+    def _add_entry(self, key: str, metadata: Any):
+        """Indexa un asset en los índices de tipo y tags."""
+        if key in self.entries:
+            self.remove(key)
+        tags = tuple(metadata.tags or ())
+        self.entries[key] = (metadata.type, tags, metadata.size)
+        self.by_type.setdefault(metadata.type, set()).add(key)
+        for tag in tags:
+            self.by_tag.setdefault(tag, set()).add(key)
+
+    def add(self, key: str, metadata: Any):
+        """Indexa (o reindexa) un asset."""
+        self._add_entry(key, metadata)
+        insort(self.by_size, (metadata.size, key))
+
+    def add_many(self, items: Iterable[Tuple[str, Any]]):
+        """Indexa muchos assets ordenando el índice de tamaños una sola vez."""
+        batch = dict(items)
+        for key, metadata in batch.items():
+            self._add_entry(key, metadata)
+        self.by_size.extend((metadata.size, key) for key, metadata in batch.items())
+        self.by_size.sort()
+
+    def remove(self, key: str):
+        """Elimina un asset de los índices."""
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return
+        asset_type, tags, size = entry
+        self._discard(self.by_type, asset_type, key)
+        for tag in tags:
+            self._discard(self.by_tag, tag, key)
+        pos = bisect_left(self.by_size, (size, key))
+        if pos < len(self.by_size) and self.by_size[pos] == (size, key):
+            del self.by_size[pos]
+
+    def _discard(self, index: Dict[str, Set[str]], value: str, key: str):
+        """Elimina una clave de un índice de conjuntos."""
+        keys = index.get(value)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del index[value]
+
+    def _size_range(self, min_size: Optional[int], max_size: Optional[int]) -> Tuple[int, int]:
+        """Posiciones del índice de tamaños dentro del rango."""
+        lo = bisect_left(self.by_size, (min_size, '')) if min_size else 0
+        hi = bisect_right(self.by_size, (max_size, '￿')) if max_size else len(self.by_size)
+        return lo, hi
+
+    def query(self,
+              asset_type: Optional[str] = None,
+              tags: Optional[Iterable[str]] = None,
+              min_size: Optional[int] = None,
+              max_size: Optional[int] = None) -> Iterator[str]:
+        """Itera de forma perezosa los hashes que cumplen los criterios."""
+        # Conjuntos candidatos, de menor a mayor
+        sets: List[Set[str]] = []
+        if asset_type:
+            sets.append(self.by_type.get(asset_type, set()))
+        for tag in set(tags or ()):
+            sets.append(self.by_tag.get(tag, set()))
+        sets.sort(key=len)
+
+        has_size = bool(min_size or max_size)
+        lo, hi = self._size_range(min_size, max_size) if has_size else (0, 0)
+
+        # Recorrer el rango de tamaños si es el candidato más selectivo
+        if has_size and (not sets or hi - lo <= len(sets[0])):
+            for pos in range(lo, hi):
+                key = self.by_size[pos][1]
+                if all(key in s for s in sets):
+                    yield key
+            return
+
+        if not sets:
+            yield from self.entries
+            return
+
+        driver, others = sets[0], sets[1:]
+        for key in driver:
+            if not all(key in s for s in others):
+                continue
+            if has_size:
+                size = self.entries[key][2]
+                if (min_size and size < min_size) or (max_size and size > max_size):
+                    continue
+            yield key
@@ -1,13 +1,19 @@
 import os
 import json
 import logging
+import fnmatch
+import itertools
 from pathlib import Path
-from typing import Dict, List, Optional, Union
-import hashlib
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Union
 from PIL import Image
 import numpy as np
 from dataclasses import dataclass
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Executor, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from .metadata_store import MetadataStore, MetadataTable, open_metadata_table
+from .hashing import get_hashing_service
+from .integrity_validator import IntegrityValidator, ValidationEvent
+from .asset_index import AssetIndex
+from .asset_watcher import AssetWatcher, WatchEvent
 
 # Configuración de logging
 logging.basicConfig(
@@ -30,51 +36,71 @@ class AssetMetadata:
     lod_level: Optional[int] = None
     tags: List[str] = None
 
+@dataclass
+class RegistrationEvent:
+    """Evento de progreso emitido por cada archivo de un registro masivo."""
+    path: str
+    metadata: Optional[AssetMetadata]
+    error: Optional[str]
+    done: int
+
+def probe_image_dimensions(file_path: Union[str, Path]) -> tuple:
+    """Lee las dimensiones de una imagen (función apta para pools de procesos)."""
+    with Image.open(file_path) as img:
+        return img.size
+
+def probe_audio_duration(file_path: Union[str, Path]) -> float:
+    """Lee la duración de un WAV (función apta para pools de procesos)."""
+    import wave
+    with wave.open(str(file_path), 'rb') as wav:
+        return wav.getnframes() / float(wav.getframerate())
+
 class AssetManager:
     """Gestor principal de assets."""
     
-    def __init__(self, base_path: str = "assets"):
+    def __init__(self,
+                 base_path: str = "assets",
+                 metadata_store: Optional[MetadataStore] = None):
         self.base_path = Path(base_path)
         self.metadata_path = self.base_path / "metadata"
         self.cache_path = self.base_path / "cache"
         self.logger = logging.getLogger("AssetManager")
+        self.metadata_store = metadata_store
+        self.hasher = get_hashing_service(metadata_store)
         
         # Crear directorios necesarios
         self.metadata_path.mkdir(parents=True, exist_ok=True)
         self.cache_path.mkdir(parents=True, exist_ok=True)
         
         # Cargar metadatos existentes
-        self.metadata: Dict[str, AssetMetadata] = self._load_metadata()
+        self.metadata: MetadataTable = self._load_metadata()
+        
+        # Índices secundarios para búsquedas
+        self.index = AssetIndex()
+        self.index.add_many(self.metadata.items())
         
         # Pool de hilos para operaciones asíncronas
-        self.executor = ThreadPoolExecutor(max_workers=4)
+        self.max_workers = 4
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers)
         
-    def _load_metadata(self) -> Dict[str, AssetMetadata]:
-        """Carga los metadatos desde el archivo JSON."""
-        metadata_file = self.metadata_path / "assets_metadata.json"
-        if metadata_file.exists():
-            with open(metadata_file, 'r') as f:
-                data = json.load(f)
-                return {k: AssetMetadata(**v) for k, v in data.items()}
-        return {}
+        # Validador incremental de integridad
+        self.validator = IntegrityValidator(self.metadata_path, metadata_store)
         
-    def _save_metadata(self):
-        """Guarda los metadatos en el archivo JSON."""
-        metadata_file = self.metadata_path / "assets_metadata.json"
-        with open(metadata_file, 'w') as f:
-            json.dump(
-                {k: v.__dict__ for k, v in self.metadata.items()},
-                f,
-                indent=2
-            )
+    def _load_metadata(self) -> MetadataTable:
+        """Abre la tabla de metadatos en el almacén compartido."""
+        return open_metadata_table(
+            self.metadata_path / "assets_metadata.json",
+            AssetMetadata,
+            self.metadata_store
+        )
+        
+    def _save_metadata(self, *keys: str):
+        """Persiste los metadatos modificados."""
+        self.metadata.save(*keys)
             
     def _calculate_hash(self, file_path: Path) -> str:
-        """Calcula el hash SHA-256 de un archivo."""
-        sha256_hash = hashlib.sha256()
-        with open(file_path, "rb") as f:
-            for byte_block in iter(lambda: f.read(4096), b""):
-                sha256_hash.update(byte_block)
-        return sha256_hash.hexdigest()
+        """Calcula el hash SHA-256 de un archivo mediante el servicio compartido."""
+        return self.hasher.hash_file(file_path)
         
     def _get_asset_type(self, file_path: Path) -> str:
         """Determina el tipo de asset basado en la extensión."""
@@ -89,23 +115,26 @@ class AssetManager:
             return 'image'
         return 'unknown'
         
-    def _get_image_dimensions(self, file_path: Path) -> Optional[tuple]:
+    def _get_image_dimensions(self,
+                              file_path: Path,
+                              probe_executor: Optional[Executor] = None) -> Optional[tuple]:
         """Obtiene las dimensiones de una imagen."""
         try:
-            with Image.open(file_path) as img:
-                return img.size
+            if probe_executor is not None:
+                return probe_executor.submit(probe_image_dimensions, str(file_path)).result()
+            return probe_image_dimensions(file_path)
         except Exception as e:
             self.logger.error(f"Error al obtener dimensiones de imagen {file_path}: {e}")
             return None
             
-    def _get_audio_duration(self, file_path: Path) -> Optional[float]:
+    def _get_audio_duration(self,
+                            file_path: Path,
+                            probe_executor: Optional[Executor] = None) -> Optional[float]:
         """Obtiene la duración de un archivo de audio."""
         try:
-            import wave
-            with wave.open(file_path, 'rb') as wav:
-                frames = wav.getnframes()
-                rate = wav.getframerate()
-                return frames / float(rate)
+            if probe_executor is not None:
+                return probe_executor.submit(probe_audio_duration, str(file_path)).result()
+            return probe_audio_duration(file_path)
         except Exception as e:
             self.logger.error(f"Error al obtener duración de audio {file_path}: {e}")
             return None
@@ -134,6 +163,39 @@ class AssetManager:
             
         return tags
         
+    def _build_metadata(self,
+                        file_path: Path,
+                        probe_executor: Optional[Executor] = None) -> AssetMetadata:
+        """Calcula los metadatos de un archivo sin registrarlo."""
+        if not file_path.exists():
+            raise FileNotFoundError(f"Archivo no encontrado: {file_path}")
+            
+        # Calcular metadatos
+        asset_type = self._get_asset_type(file_path)
+        file_size = file_path.stat().st_size
+        file_hash = self._calculate_hash(file_path)
+        
+        # Crear objeto de metadatos
+        metadata = AssetMetadata(
+            name=file_path.stem,
+            type=asset_type,
+            path=str(file_path.relative_to(self.base_path)),
+            size=file_size,
+            hash=file_hash,
+            format=file_path.suffix[1:],
+            tags=self._extract_tags(file_path)
+        )
+        
+        # Agregar metadatos específicos según el tipo
+        if asset_type == 'texture':
+            metadata.dimensions = self._get_image_dimensions(file_path, probe_executor)
+        elif asset_type == 'sound':
+            metadata.duration = self._get_audio_duration(file_path, probe_executor)
+        elif asset_type == 'model':
+            metadata.lod_level = self._get_lod_level(file_path)
+            
+        return metadata
+        
     def register_asset(self, file_path: Union[str, Path]) -> Optional[AssetMetadata]:
         """Registra un nuevo asset en el sistema."""
         try:
@@ -142,33 +204,11 @@ class AssetManager:
                 self.logger.error(f"Archivo no encontrado: {file_path}")
                 return None
                 
-            # Calcular metadatos
-            asset_type = self._get_asset_type(file_path)
-            file_size = file_path.stat().st_size
-            file_hash = self._calculate_hash(file_path)
-            
-            # Crear objeto de metadatos
-            metadata = AssetMetadata(
-                name=file_path.stem,
-                type=asset_type,
-                path=str(file_path.relative_to(self.base_path)),
-                size=file_size,
-                hash=file_hash,
-                format=file_path.suffix[1:],
-                tags=self._extract_tags(file_path)
-            )
-            
-            # Agregar metadatos específicos según el tipo
-            if asset_type == 'texture':
-                metadata.dimensions = self._get_image_dimensions(file_path)
-            elif asset_type == 'sound':
-                metadata.duration = self._get_audio_duration(file_path)
-            elif asset_type == 'model':
-                metadata.lod_level = self._get_lod_level(file_path)
+            metadata = self._build_metadata(file_path)
                 
-            # Guardar metadatos
-            self.metadata[file_hash] = metadata
-            self._save_metadata()
+            # Guardar metadatos y actualizar índices
+            self.metadata[metadata.hash] = metadata
+            self.index.add(metadata.hash, metadata)
             
             self.logger.info(f"Asset registrado: {file_path}")
             return metadata
@@ -177,30 +217,166 @@ class AssetManager:
             self.logger.error(f"Error al registrar asset {file_path}: {e}")
             return None
             
+    def _walk_directory(self,
+                        directory: Path,
+                        recursive: bool,
+                        patterns: Optional[Iterable[str]]) -> Iterator[Path]:
+        """Recorre un directorio de forma perezosa filtrando por patrones."""
+        patterns = list(patterns or ())
+        stack = [directory]
+        while stack:
+            current = stack.pop()
+            try:
+                with os.scandir(current) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            if recursive:
+                                stack.append(Path(entry.path))
+                        elif entry.is_file():
+                            if not patterns or any(fnmatch.fnmatch(entry.name, p) for p in patterns):
+                                yield Path(entry.path)
+            except OSError as e:
+                self.logger.error(f"Error al recorrer directorio {current}: {e}")
+                
+    def register_directory(self,
+                           directory: Union[str, Path],
+                           recursive: bool = True,
+                           patterns: Optional[Iterable[str]] = None,
+                           progress: Optional[Callable[[RegistrationEvent], None]] = None,
+                           probe_executor: Optional[Executor] = None) -> Dict[str, List]:
+        """Registra en bloque todos los archivos de un directorio.
+        
+        El recorrido se va encolando en el pool de hilos del gestor con un
+        número acotado de tareas en vuelo; hash, dimensiones, duración y LOD
+        se calculan en los hilos (o en `probe_executor`, p. ej. un pool de
+        procesos, para los análisis costosos) y todos los metadatos se
+        guardan al final en una única transacción.
+        """
+        results = {
+            'registered': [],
+            'errors': []
+        }
+        max_pending = 2 * self.max_workers
+        pending: Dict = {}
+        done = 0
+        
+        def collect(finished):
+            nonlocal done
+            for future in finished:
+                file_path = pending.pop(future)
+                done += 1
+                try:
+                    metadata = future.result()
+                except Exception as e:
+                    self.logger.error(f"Error al registrar asset {file_path}: {e}")
+                    results['errors'].append((str(file_path), str(e)))
+                    event = RegistrationEvent(str(file_path), None, str(e), done)
+                else:
+                    results['registered'].append(metadata)
+                    event = RegistrationEvent(str(file_path), metadata, None, done)
+                if progress:
+                    progress(event)
+                    
+        for file_path in self._walk_directory(Path(directory), recursive, patterns):
+            future = self.executor.submit(self._build_metadata, file_path, probe_executor)
+            pending[future] = file_path
+            while len(pending) >= max_pending:
+                finished, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+                collect(finished)
+                
+        while pending:
+            finished, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+            collect(finished)
+            
+        # Guardar todos los metadatos en una sola transacción
+        try:
+            with self.metadata.batch():
+                for metadata in results['registered']:
+                    self.metadata[metadata.hash] = metadata
+            self.index.add_many((metadata.hash, metadata) for metadata in results['registered'])
+            self.logger.info(f"Directorio registrado: {directory} ({len(results['registered'])} assets)")
+        except Exception as e:
+            self.logger.error(f"Error al guardar metadatos de {directory}: {e}")
+            
+        return results
+        
+    def watch(self,
+              debounce: float = 0.5,
+              poll_interval: float = 1.0,
+              use_inotify: bool = True) -> AssetWatcher:
+        """Inicia un observador que mantiene los metadatos sincronizados con el disco."""
+        watcher = AssetWatcher(
+            self.base_path,
+            self._apply_watch_events,
+            patterns=['*.glb', '*.gltf', '*.fbx', '*.obj', '*.stl',
+                      '*.png', '*.jpg', '*.jpeg', '*.hdr', '*.exr',
+                      '*.mp3', '*.wav', '*.ogg', '*.svg', '*.ico'],
+            exclude=[self.metadata_path, self.cache_path],
+            debounce=debounce,
+            poll_interval=poll_interval,
+            metadata_store=self.metadata_store,
+            use_inotify=use_inotify
+        )
+        return watcher.start()
+        
+    def _unregister_path(self, asset_hash: Optional[str], file_path: Path) -> Optional[AssetMetadata]:
+        """Elimina el registro de un asset si sigue apuntando a la ruta dada."""
+        metadata = self.metadata.get(asset_hash) if asset_hash else None
+        if metadata is None or metadata.path != str(file_path.relative_to(self.base_path)):
+            return None
+        del self.metadata[asset_hash]
+        self.index.remove(asset_hash)
+        return metadata
+        
+    def _apply_watch_events(self, events: List[WatchEvent]):
+        """Aplica los cambios detectados por el observador sin reprocesar renombrados."""
+        for event in events:
+            if event.kind == 'moved':
+                metadata = self._unregister_path(event.digest, event.old_path)
+                if metadata is None:
+                    self.register_asset(event.path)
+                    continue
+                # Mismo contenido: solo cambian ruta, nombre y tags
+                metadata.name = event.path.stem
+                metadata.path = str(event.path.relative_to(self.base_path))
+                metadata.tags = self._extract_tags(event.path)
+                self.metadata[event.digest] = metadata
+                self.index.add(event.digest, metadata)
+                self.logger.info(f"Asset renombrado: {event.old_path} -> {event.path}")
+            elif event.kind == 'deleted':
+                if self._unregister_path(event.old_digest, event.path) is not None:
+                    self.logger.info(f"Asset eliminado: {event.path}")
+            else:
+                if event.kind == 'modified':
+                    self._unregister_path(event.old_digest, event.path)
+                self.register_asset(event.path)
+                
     def get_asset(self, asset_hash: str) -> Optional[AssetMetadata]:
         """Obtiene los metadatos de un asset por su hash."""
         return self.metadata.get(asset_hash)
         
+    def iter_assets(self,
+                    asset_type: Optional[str] = None,
+                    tags: Optional[List[str]] = None,
+                    min_size: Optional[int] = None,
+                    max_size: Optional[int] = None) -> Iterator[AssetMetadata]:
+        """Itera de forma perezosa los assets que coinciden con los criterios."""
+        for asset_hash in self.index.query(asset_type, tags, min_size, max_size):
+            metadata = self.metadata.get(asset_hash)
+            if metadata is not None:
+                yield metadata
+                
     def find_assets(self, 
                    asset_type: Optional[str] = None,
                    tags: Optional[List[str]] = None,
                    min_size: Optional[int] = None,
-                   max_size: Optional[int] = None) -> List[AssetMetadata]:
+                   max_size: Optional[int] = None,
+                   limit: Optional[int] = None,
+                   offset: int = 0) -> List[AssetMetadata]:
         """Busca assets que coincidan con los criterios especificados."""
-        results = []
-        
-        for metadata in self.metadata.values():
-            if asset_type and metadata.type != asset_type:
-                continue
-            if tags and not all(tag in metadata.tags for tag in tags):
-                continue
-            if min_size and metadata.size < min_size:
-                continue
-            if max_size and metadata.size > max_size:
-                continue
-            results.append(metadata)
-            
-        return results
+        results = self.iter_assets(asset_type, tags, min_size, max_size)
+        stop = offset + limit if limit is not None else None
+        return list(itertools.islice(results, offset, stop))
         
     def optimize_asset(self, asset_hash: str) -> bool:
         """Optimiza un asset específico."""
@@ -274,26 +450,32 @@ class AssetManager:
         except Exception as e:
             self.logger.error(f"Error al limpiar caché: {e}")
             
-    def validate_assets(self) -> Dict[str, List[str]]:
-        """Valida la integridad de todos los assets."""
+    def validate_assets(self,
+                        incremental: bool = True,
+                        sample_rate: Optional[float] = None,
+                        progress: Optional[Callable[[ValidationEvent], None]] = None) -> Dict[str, List[str]]:
+        """Valida la integridad de todos los assets.
+        
+        Con `incremental` solo se vuelven a hashear los archivos cuya huella
+        (inode, tamaño, mtime) cambió; `sample_rate` comprueba además una
+        fracción aleatoria de los no modificados.
+        """
         results = {
             'valid': [],
             'invalid': [],
             'missing': []
         }
         
-        for metadata in self.metadata.values():
-            file_path = self.base_path / metadata.path
+        paths = {}
+        entries = []
+        for asset_hash, metadata in self.metadata.items():
+            paths[asset_hash] = metadata.path
+            entries.append((asset_hash, self.base_path / metadata.path, metadata.hash))
             
-            if not file_path.exists():
-                results['missing'].append(metadata.path)
-                continue
-                
-            current_hash = self._calculate_hash(file_path)
-            if current_hash == metadata.hash:
-                results['valid'].append(metadata.path)
-            else:
-                results['invalid'].append(metadata.path)
+        for event in self.validator.validate(entries, incremental, sample_rate):
+            results[event.status].append(paths[event.key])
+            if progress:
+                progress(event)
                 
         return results
         
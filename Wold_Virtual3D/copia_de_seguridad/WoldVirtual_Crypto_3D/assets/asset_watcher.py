@@ -0,0 +1,390 @@
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import fnmatch
+import logging
+import threading
+from pathlib import Path
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+from .hashing import get_hashing_service
+
+try:
+    import ctypes
+    import ctypes.util
+except ImportError:
+    ctypes = None
+
+# Máscaras de inotify (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = getattr(os, 'O_CLOEXEC', 0o2000000)
+
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO |
+              IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF)
+
+_EVENT_HEADER = struct.Struct('iIII')
+
+@dataclass
+class WatchEvent:
+    """Cambio detectado en disco tras agrupar una ráfaga de eventos.
+
+    `kind` es 'created', 'modified', 'moved' o 'deleted'. Los renombrados se
+    detectan por hash de contenido: un archivo que desaparece y otro que
+    aparece con el mismo digest en la misma ráfaga forman un 'moved'.
+    """
+    kind: str
+    path: Path
+    digest: Optional[str]
+    old_path: Optional[Path] = None
+    old_digest: Optional[str] = None
+
+class _InotifyBackend:
+    """Fuente de cambios basada en inotify con vigilancia recursiva."""
+
+    name = 'inotify'
+
+    def __init__(self, root: Path, accept_dir: Callable[[Path], bool]):
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._rm_watch = libc.inotify_rm_watch
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1")
+        self.root = root
+        self.accept_dir = accept_dir
+        self.watches: Dict[int, Path] = {}
+        self.add_tree(root)
+
+    def add_tree(self, directory: Path) -> Set[Path]:
+        """Vigila un árbol de directorios y devuelve los archivos ya presentes."""
+        found: Set[Path] = set()
+        stack = [directory]
+        while stack:
+            current = stack.pop()
+            if not self.accept_dir(current):
+                continue
+            wd = self._add_watch(self.fd, os.fsencode(current), WATCH_MASK)
+            if wd < 0:
+                continue
+            self.watches[wd] = current
+            try:
+                with os.scandir(current) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(Path(entry.path))
+                        else:
+                            found.add(Path(entry.path))
+            except OSError:
+                pass
+        return found
+
+    def remove_tree(self, directory: Path):
+        """Deja de vigilar un árbol que se movió (se vuelve a añadir en su destino)."""
+        for wd, path in list(self.watches.items()):
+            if path == directory or directory in path.parents:
+                self._rm_watch(self.fd, wd)
+                del self.watches[wd]
+
+    def wait(self, timeout: float) -> Tuple[Set[Path], bool]:
+        """Espera eventos y devuelve (rutas tocadas, hace falta un reescaneo)."""
+        touched: Set[Path] = set()
+        rescan = False
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return touched, rescan
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except OSError as e:
+                if e.errno in (errno.EAGAIN, errno.EWOULDBLOCK):
+                    break
+                raise
+            offset = 0
+            while offset < len(data):
+                wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = data[offset:offset + length].rstrip(b'\0')
+                offset += length
+                if mask & IN_Q_OVERFLOW:
+                    rescan = True
+                    continue
+                directory = self.watches.get(wd)
+                if mask & IN_IGNORED:
+                    self.watches.pop(wd, None)
+                    continue
+                if directory is None or not name:
+                    continue
+                path = directory / os.fsdecode(name)
+                touched.add(path)
+                if mask & IN_ISDIR and mask & IN_MOVED_FROM:
+                    self.remove_tree(path)
+                if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                    # Los archivos creados antes de vigilar el directorio no generan eventos
+                    touched |= self.add_tree(path)
+        return touched, rescan
+
+    def close(self):
+        """Cierra el descriptor de inotify."""
+        os.close(self.fd)
+
+class _PollingBackend:
+    """Fuente de cambios por sondeo periódico de (inode, tamaño, mtime)."""
+
+    name = 'polling'
+
+    def __init__(self, root: Path, accept_dir: Callable[[Path], bool], stop: threading.Event):
+        self.root = root
+        self.accept_dir = accept_dir
+        self.stop = stop
+        self.snapshot = self._scan()
+
+    def _scan(self) -> Dict[Path, Tuple[int, int, int]]:
+        """Toma una instantánea de las huellas de todos los archivos."""
+        snapshot = {}
+        stack = [self.root]
+        while stack:
+            current = stack.pop()
+            if not self.accept_dir(current):
+                continue
+            try:
+                with os.scandir(current) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(Path(entry.path))
+                        elif entry.is_file(follow_symlinks=False):
+                            stat = entry.stat(follow_symlinks=False)
+                            snapshot[Path(entry.path)] = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+            except OSError:
+                pass
+        return snapshot
+
+    def wait(self, timeout: float) -> Tuple[Set[Path], bool]:
+        """Espera el intervalo de sondeo y devuelve las rutas que cambiaron."""
+        if self.stop.wait(timeout):
+            return set(), False
+        snapshot = self._scan()
+        previous = self.snapshot
+        self.snapshot = snapshot
+        touched = {path for path, fingerprint in snapshot.items() if previous.get(path) != fingerprint}
+        touched.update(path for path in previous if path not in snapshot)
+        return touched, False
+
+    def close(self):
+        pass
+
+class AssetWatcher:
+    """Observador de un directorio de assets que notifica cambios agrupados.
+
+    Usa inotify cuando está disponible y sondeo periódico en otro caso. Los
+    eventos se acumulan hasta que pasan `debounce` segundos sin actividad;
+    entonces se hashean solo los archivos tocados y se entrega al manejador
+    la lista de `WatchEvent` resultante.
+    """
+
+    def __init__(self,
+                 root: Union[str, Path],
+                 handler: Callable[[List[WatchEvent]], None],
+                 patterns: Optional[Iterable[str]] = None,
+                 exclude: Iterable[Union[str, Path]] = (),
+                 debounce: float = 0.5,
+                 poll_interval: float = 1.0,
+                 metadata_store=None,
+                 use_inotify: bool = True):
+        self.root = Path(root)
+        self.handler = handler
+        self.patterns = [p.lower() for p in (patterns or ())]
+        self.exclude = [Path(p) for p in exclude]
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self.hasher = get_hashing_service(metadata_store)
+        self.logger = logging.getLogger("AssetWatcher")
+
+        # Último digest conocido de cada archivo vigilado
+        self.known: Dict[Path, str] = {}
+
+        self.backend = None
+        self._stop = threading.Event()
+        self._ready = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _accept_dir(self, directory: Path) -> bool:
+        """Indica si un directorio debe vigilarse."""
+        if directory.name.startswith('.') and directory != self.root:
+            return False
+        return not any(directory == ex or ex in directory.parents for ex in self.exclude)
+
+    def _matches(self, path: Path) -> bool:
+        """Indica si un archivo es relevante para el observador."""
+        if path.name.startswith('.') or not self._accept_dir(path.parent):
+            return False
+        name = path.name.lower()
+        return not self.patterns or any(fnmatch.fnmatch(name, p) for p in self.patterns)
+
+    def _walk(self, directory: Path) -> Iterator[Path]:
+        """Recorre los archivos relevantes bajo un directorio."""
+        stack = [directory]
+        while stack:
+            current = stack.pop()
+            if not self._accept_dir(current):
+                continue
+            try:
+                with os.scandir(current) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(Path(entry.path))
+                        elif entry.is_file(follow_symlinks=False) and self._matches(Path(entry.path)):
+                            yield Path(entry.path)
+            except OSError:
+                pass
+
+    def _create_backend(self):
+        """Crea la fuente de cambios: inotify si es posible, sondeo si no."""
+        if self.use_inotify and ctypes is not None and sys.platform.startswith('linux'):
+            try:
+                return _InotifyBackend(self.root, self._accept_dir)
+            except (OSError, AttributeError) as e:
+                self.logger.warning(f"inotify no disponible, usando sondeo: {e}")
+        return _PollingBackend(self.root, self._accept_dir, self._stop)
+
+    def start(self) -> 'AssetWatcher':
+        """Inicia el observador en un hilo en segundo plano."""
+        if self._thread is not None:
+            return self
+        self._stop.clear()
+        self._ready.clear()
+        self._thread = threading.Thread(target=self._run, name="AssetWatcher", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        return self
+
+    def stop(self):
+        """Detiene el observador y espera a que termine su hilo."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> 'AssetWatcher':
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _seed(self):
+        """Registra el digest actual de todos los archivos vigilados."""
+        for path in self._walk(self.root):
+            try:
+                self.known[path] = self.hasher.hash_file(path)
+            except OSError:
+                pass
+
+    def _run(self):
+        """Bucle del observador: acumula eventos y los despacha tras el debounce."""
+        try:
+            # La fuente se crea antes de sembrar para no perder cambios intermedios
+            self.backend = self._create_backend()
+            self._seed()
+        except Exception as e:
+            self.logger.error(f"Error al iniciar el observador de {self.root}: {e}")
+            self._ready.set()
+            return
+        self._ready.set()
+
+        touched: Set[Path] = set()
+        last_event = 0.0
+        try:
+            while not self._stop.is_set():
+                timeout = self.debounce if touched else self.poll_interval
+                try:
+                    paths, rescan = self.backend.wait(timeout)
+                except Exception as e:
+                    self.logger.error(f"Error al leer eventos de {self.root}: {e}")
+                    paths, rescan = set(), True
+                if rescan:
+                    paths = set(paths) | set(self.known) | set(self._walk(self.root))
+                if paths:
+                    touched |= paths
+                    last_event = time.monotonic()
+                if touched and time.monotonic() - last_event >= self.debounce:
+                    self._dispatch(touched)
+                    touched = set()
+            if touched:
+                self._dispatch(touched)
+        finally:
+            self.backend.close()
+
+    def _expand(self, touched: Set[Path]) -> Set[Path]:
+        """Expande directorios tocados a los archivos que contienen o contenían."""
+        files: Set[Path] = set()
+        for path in touched:
+            if path.is_dir():
+                files.update(self._walk(path))
+            elif path in self.known or path.is_file():
+                files.add(path)
+            else:
+                # Directorio eliminado o movido fuera: sus archivos conocidos desaparecen
+                files.update(known for known in self.known if path in known.parents)
+        return files
+
+    def _dispatch(self, touched: Set[Path]):
+        """Hashea los archivos tocados y entrega los cambios al manejador."""
+        created: List[Tuple[Path, str]] = []
+        modified: List[WatchEvent] = []
+        deleted: Dict[str, List[Path]] = {}
+
+        for path in sorted(self._expand(touched)):
+            if not self._matches(path):
+                continue
+            old_digest = self.known.get(path)
+            if path.is_file():
+                try:
+                    digest = self.hasher.hash_file(path)
+                except OSError:
+                    continue
+                if digest == old_digest:
+                    continue
+                self.known[path] = digest
+                if old_digest is None:
+                    created.append((path, digest))
+                else:
+                    modified.append(WatchEvent('modified', path, digest, old_digest=old_digest))
+            elif old_digest is not None:
+                del self.known[path]
+                deleted.setdefault(old_digest, []).append(path)
+
+        # Emparejar desapariciones y apariciones con el mismo contenido
+        events: List[WatchEvent] = []
+        for path, digest in created:
+            sources = deleted.get(digest)
+            if sources:
+                old_path = sources.pop()
+                events.append(WatchEvent('moved', path, digest, old_path=old_path, old_digest=digest))
+            else:
+                modified.append(WatchEvent('created', path, digest))
+        for digest, paths in deleted.items():
+            events.extend(WatchEvent('deleted', path, None, old_digest=digest) for path in paths)
+        events.extend(modified)
+
+        if not events:
+            return
+        try:
+            self.handler(events)
+        except Exception as e:
+            self.logger.error(f"Error al aplicar cambios de {self.root}: {e}")
@@ -7,6 +7,8 @@ import numpy as np
 import soundfile as sf
 import librosa
 from dataclasses import dataclass
+from .metadata_store import MetadataStore, MetadataTable, open_metadata_table
+from .asset_watcher import AssetWatcher, WatchEvent
 
 # Configuración de logging
 logging.basicConfig(
@@ -30,37 +32,33 @@ class AudioMetadata:
 class AudioManager:
     """Gestor de archivos de audio."""
     
-    def __init__(self, base_path: str = "assets/audio"):
+    def __init__(self,
+                 base_path: str = "assets/audio",
+                 metadata_store: Optional[MetadataStore] = None):
         self.base_path = Path(base_path)
         self.metadata_path = self.base_path / "metadata"
         self.cache_path = self.base_path / "cache"
         self.logger = logging.getLogger("AudioManager")
+        self.metadata_store = metadata_store
         
         # Crear directorios necesarios
         self.metadata_path.mkdir(parents=True, exist_ok=True)
         self.cache_path.mkdir(parents=True, exist_ok=True)
         
         # Cargar metadatos existentes
-        self.metadata: Dict[str, AudioMetadata] = self._load_metadata()
+        self.metadata: MetadataTable = self._load_metadata()
         
-    def _load_metadata(self) -> Dict[str, AudioMetadata]:
-        """Carga los metadatos de audio desde el archivo JSON."""
-        metadata_file = self.metadata_path / "audio_metadata.json"
-        if metadata_file.exists():
-            with open(metadata_file, 'r') as f:
-                data = json.load(f)
-                return {k: AudioMetadata(**v) for k, v in data.items()}
-        return {}
+    def _load_metadata(self) -> MetadataTable:
+        """Abre la tabla de metadatos de audio en el almacén compartido."""
+        return open_metadata_table(
+            self.metadata_path / "audio_metadata.json",
+            AudioMetadata,
+            self.metadata_store
+        )
         
-    def _save_metadata(self):
-        """Guarda los metadatos de audio en el archivo JSON."""
-        metadata_file = self.metadata_path / "audio_metadata.json"
-        with open(metadata_file, 'w') as f:
-            json.dump(
-                {k: v.__dict__ for k, v in self.metadata.items()},
-                f,
-                indent=2
-            )
+    def _save_metadata(self, *keys: str):
+        """Persiste los metadatos de audio modificados."""
+        self.metadata.save(*keys)
             
     def _get_audio_info(self, file_path: Path) -> Optional[AudioMetadata]:
         """Obtiene información detallada de un archivo de audio."""
@@ -116,6 +114,39 @@ class AudioManager:
             self.logger.error(f"Error al registrar audio {file_path}: {e}")
             return None
             
+    def watch(self,
+              debounce: float = 0.5,
+              poll_interval: float = 1.0,
+              use_inotify: bool = True) -> AssetWatcher:
+        """Inicia un observador que mantiene los metadatos de audio sincronizados con el disco."""
+        watcher = AssetWatcher(
+            self.base_path,
+            self._apply_watch_events,
+            patterns=['*.mp3', '*.wav', '*.ogg', '*.flac', '*.m4a'],
+            exclude=[self.metadata_path, self.cache_path],
+            debounce=debounce,
+            poll_interval=poll_interval,
+            metadata_store=self.metadata_store,
+            use_inotify=use_inotify
+        )
+        return watcher.start()
+        
+    def _apply_watch_events(self, events: List[WatchEvent]):
+        """Aplica los cambios detectados por el observador sin reprocesar renombrados."""
+        for event in events:
+            if event.kind == 'moved':
+                metadata = self.metadata.pop(event.old_path.stem, None)
+                if metadata is None:
+                    self.register_audio(event.path)
+                    continue
+                self.metadata[event.path.stem] = metadata
+                self.logger.info(f"Audio renombrado: {event.old_path} -> {event.path}")
+            elif event.kind == 'deleted':
+                if self.metadata.pop(event.path.stem, None) is not None:
+                    self.logger.info(f"Audio eliminado: {event.path}")
+            else:
+                self.register_audio(event.path)
+                
     def convert_format(self, 
                       file_path: Union[str, Path],
                       target_format: str,
@@ -0,0 +1,153 @@
+import os
+import uuid
+import shutil
+import logging
+from pathlib import Path
+from typing import Tuple, Union
+from .hashing import DEFAULT_ALGORITHM, READ_CHUNK_SIZE, hash_file, new_hasher
+
+# Código de ioctl FICLONE de Linux (copia por referencia en btrfs/xfs)
+FICLONE = 0x40049409
+
+class BlobStore:
+    """Almacén de blobs direccionado por contenido.
+
+    Cada blob se guarda una sola vez bajo su digest. La ingesta calcula el
+    hash en una única pasada mientras copia, o clona/enlaza el origen cuando
+    comparte sistema de archivos con el almacén (`link_mode`):
+
+    - 'reflink': clonado copy-on-write si el sistema lo soporta; si no, copia.
+    - 'hardlink': enlace duro al origen; solo para orígenes inmutables.
+    - 'copy': siempre copia en streaming.
+    """
+
+    def __init__(self,
+                 root: Union[str, Path],
+                 algorithm: str = DEFAULT_ALGORITHM,
+                 link_mode: str = 'reflink',
+                 chunk_size: int = READ_CHUNK_SIZE):
+        self.root = Path(root)
+        self.tmp_path = self.root / "tmp"
+        self.algorithm = algorithm
+        self.link_mode = link_mode
+        self.chunk_size = chunk_size
+        self.logger = logging.getLogger("BlobStore")
+
+        # Crear directorios necesarios
+        self.tmp_path.mkdir(parents=True, exist_ok=True)
+        self._root_dev = self.root.stat().st_dev
+        self._reflink_supported = True
+
+    def blob_path(self, digest: str) -> Path:
+        """Ruta de un blob a partir de su digest."""
+        return self.root / digest[:2] / digest
+
+    def has(self, digest: str) -> bool:
+        """Verifica si un blob existe."""
+        return self.blob_path(digest).exists()
+
+    def _new_tmp(self) -> Path:
+        """Ruta temporal única dentro del almacén."""
+        return self.tmp_path / uuid.uuid4().hex
+
+    def _clone(self, source: Path, target: Path) -> bool:
+        """Intenta una copia por referencia (reflink). Devuelve True si tuvo éxito."""
+        if not self._reflink_supported:
+            return False
+        try:
+            import fcntl
+        except ImportError:
+            self._reflink_supported = False
+            return False
+        try:
+            with open(source, 'rb') as src, open(target, 'wb') as dst:
+                fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            return True
+        except OSError:
+            # El sistema de archivos no lo soporta: no volver a intentarlo
+            self._reflink_supported = False
+            if target.exists():
+                target.unlink()
+            return False
+
+    def _commit(self, tmp: Path, digest: str, source: Path) -> Path:
+        """Mueve un temporal a su ruta definitiva o lo descarta si ya existe."""
+        blob = self.blob_path(digest)
+        if blob.exists():
+            tmp.unlink()
+            return blob
+        blob.parent.mkdir(exist_ok=True)
+        shutil.copystat(source, tmp)
+        os.replace(tmp, blob)
+        return blob
+
+    def _stream_copy(self, source: Path) -> Tuple[str, Path]:
+        """Copia el origen a un temporal calculando el digest en la misma pasada."""
+        hasher = new_hasher(self.algorithm)
+        buffer = bytearray(self.chunk_size)
+        view = memoryview(buffer)
+        tmp = self._new_tmp()
+        try:
+            with open(source, 'rb', buffering=0) as src, open(tmp, 'wb') as dst:
+                while True:
+                    n = src.readinto(buffer)
+                    if not n:
+                        break
+                    hasher.update(view[:n])
+                    dst.write(view[:n])
+        except Exception:
+            if tmp.exists():
+                tmp.unlink()
+            raise
+        return hasher.hexdigest(), tmp
+
+    def ingest(self, source: Union[str, Path]) -> Tuple[str, int, Path]:
+        """Añade un archivo al almacén. Devuelve (digest, tamaño, ruta del blob)."""
+        source = Path(source)
+        stat = source.stat()
+
+        # Mismo sistema de archivos: una lectura para el hash y sin copia
+        if self.link_mode != 'copy' and stat.st_dev == self._root_dev:
+            if self.link_mode == 'hardlink':
+                digest = hash_file(source, self.algorithm)
+                blob = self.blob_path(digest)
+                if blob.exists():
+                    return digest, stat.st_size, blob
+                try:
+                    blob.parent.mkdir(exist_ok=True)
+                    os.link(source, blob)
+                    return digest, stat.st_size, blob
+                except FileExistsError:
+                    return digest, stat.st_size, blob
+                except OSError as e:
+                    self.logger.warning(f"No se pudo enlazar {source}, se copiará: {e}")
+            else:
+                tmp = self._new_tmp()
+                if self._clone(source, tmp):
+                    digest = hash_file(tmp, self.algorithm)
+                    return digest, stat.st_size, self._commit(tmp, digest, source)
+
+        # Copia en streaming con hash en una sola pasada
+        digest, tmp = self._stream_copy(source)
+        return digest, stat.st_size, self._commit(tmp, digest, source)
+
+    def link(self, digest: str, target: Union[str, Path]) -> Path:
+        """Materializa un blob en otra ruta mediante enlace duro (o copia)."""
+        target = Path(target)
+        blob = self.blob_path(digest)
+        try:
+            os.link(blob, target)
+        except OSError:
+            shutil.copy2(blob, target)
+        return target
+
+    def release(self, digest: str) -> bool:
+        """Elimina un blob si ya no está enlazado desde ninguna entrada."""
+        blob = self.blob_path(digest)
+        try:
+            if blob.stat().st_nlink <= 1:
+                blob.unlink()
+                return True
+        except FileNotFoundError:
+            pass
+        return False
@@ -1,12 +1,18 @@
 import os
 import json
 import logging
-import hashlib
-import shutil
+import time
+import heapq
+import itertools
 from pathlib import Path
-from typing import Dict, List, Optional, Union, Any
+from typing import Callable, Dict, List, Optional, Union, Any, Set, Tuple
 from dataclasses import dataclass
 from datetime import datetime
+from .metadata_store import MetadataStore, MetadataTable, open_metadata_table
+from .hashing import get_hashing_service
+from .blob_store import BlobStore
+from .eviction_policies import EvictionPolicy, get_eviction_policy
+from .integrity_validator import IntegrityValidator, ValidationEvent
 
 # Configuración de logging
 logging.basicConfig(
@@ -31,62 +37,218 @@ class CacheMetadata:
 class CacheManager:
     """Gestor de caché."""
     
-    def __init__(self, base_path: str = "assets/cache"):
+    def __init__(self,
+                 base_path: str = "assets/cache",
+                 metadata_store: Optional[MetadataStore] = None,
+                 link_mode: str = 'reflink',
+                 max_size: Optional[int] = None,
+                 eviction_policy: Union[str, EvictionPolicy] = 'lru'):
         self.base_path = Path(base_path)
         self.metadata_path = self.base_path / "metadata"
         self.cache_path = self.base_path / "data"
         self.logger = logging.getLogger("CacheManager")
+        self.metadata_store = metadata_store
+        self.hasher = get_hashing_service(metadata_store)
         
         # Crear directorios necesarios
         self.base_path.mkdir(parents=True, exist_ok=True)
         self.metadata_path.mkdir(parents=True, exist_ok=True)
         self.cache_path.mkdir(parents=True, exist_ok=True)
         
+        # Almacén de contenido deduplicado por digest
+        self.blob_store = BlobStore(self.base_path / "blobs", link_mode=link_mode)
+        
         # Cargar metadatos existentes
-        self.metadata: Dict[str, CacheMetadata] = self._load_metadata()
+        self.metadata: MetadataTable = self._load_metadata()
         
-    def _load_metadata(self) -> Dict[str, CacheMetadata]:
-        """Carga los metadatos de caché desde el archivo JSON."""
-        metadata_file = self.metadata_path / "cache_metadata.json"
-        if metadata_file.exists():
-            with open(metadata_file, 'r') as f:
-                data = json.load(f)
-                return {k: CacheMetadata(**v) for k, v in data.items()}
-        return {}
+        # Validador incremental de integridad
+        self.validator = IntegrityValidator(self.metadata_path, metadata_store)
         
-    def _save_metadata(self):
-        """Guarda los metadatos de caché en el archivo JSON."""
-        metadata_file = self.metadata_path / "cache_metadata.json"
-        with open(metadata_file, 'w') as f:
-            json.dump(
-                {k: v.__dict__ for k, v in self.metadata.items()},
-                f,
-                indent=2
-            )
+        # Presupuesto en bytes y política de expulsión
+        self.max_size = max_size
+        self.eviction_policy = get_eviction_policy(eviction_policy)
+        
+        # Índices en memoria
+        self._index: Dict[Tuple[str, str], str] = {}
+        self._dependents: Dict[str, Set[str]] = {}
+        self._pinned: Set[str] = set()
+        self._digest_refs: Dict[str, int] = {}
+        self._priorities: Dict[str, Tuple[float, float]] = {}
+        self._heap: List[Tuple[Tuple[float, float], int, str]] = []
+        self._seq = itertools.count()
+        self.stored_size = 0
+        
+        # Contadores
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.evicted_bytes = 0
+        
+        self._build_index()
+        
+    def _load_metadata(self) -> MetadataTable:
+        """Abre la tabla de metadatos de caché en el almacén compartido."""
+        return open_metadata_table(
+            self.metadata_path / "cache_metadata.json",
+            CacheMetadata,
+            self.metadata_store
+        )
+        
+    def _save_metadata(self, *keys: str):
+        """Persiste los metadatos de caché modificados."""
+        self.metadata.save(*keys)
+            
+    def _build_index(self):
+        """Construye los índices en memoria a partir de los metadatos."""
+        for cache_name, metadata in self.metadata.items():
+            try:
+                last_access = datetime.fromisoformat(metadata.last_accessed).timestamp()
+            except ValueError:
+                last_access = 0.0
+            self._index_entry(cache_name, metadata, last_access)
+            
+    def _index_entry(self,
+                     cache_name: str,
+                     metadata: CacheMetadata,
+                     last_access: Optional[float] = None):
+        """Añade una entrada a los índices."""
+        self._index[(metadata.name, metadata.type)] = cache_name
+        
+        # Contabilizar bytes por blob único
+        refs = self._digest_refs.get(metadata.hash, 0)
+        if refs == 0:
+            self.stored_size += metadata.size
+        self._digest_refs[metadata.hash] = refs + 1
+        
+        # Índice inverso de dependencias
+        for dep in metadata.dependencies:
+            self._dependents.setdefault(dep, set()).add(cache_name)
+            
+        self._touch(cache_name, metadata, last_access)
+        
+    def _unindex_entry(self, cache_name: str, metadata: CacheMetadata):
+        """Elimina una entrada de los índices."""
+        key = (metadata.name, metadata.type)
+        if self._index.get(key) == cache_name:
+            del self._index[key]
+            
+        refs = self._digest_refs.get(metadata.hash, 0) - 1
+        if refs <= 0:
+            self._digest_refs.pop(metadata.hash, None)
+            self.stored_size -= metadata.size
+        else:
+            self._digest_refs[metadata.hash] = refs
+            
+        for dep in metadata.dependencies:
+            dependents = self._dependents.get(dep)
+            if dependents:
+                dependents.discard(cache_name)
+                if not dependents:
+                    del self._dependents[dep]
+                    
+        self._priorities.pop(cache_name, None)
+        self._pinned.discard(cache_name)
+        
+    def _touch(self,
+               cache_name: str,
+               metadata: CacheMetadata,
+               last_access: Optional[float] = None):
+        """Actualiza la prioridad de expulsión de una entrada."""
+        if last_access is None:
+            last_access = time.time()
+        priority = self.eviction_policy.priority(metadata, last_access)
+        self._priorities[cache_name] = priority
+        heapq.heappush(self._heap, (priority, next(self._seq), cache_name))
+        
+        # Compactar entradas obsoletas del montículo
+        if len(self._heap) > 2 * len(self._priorities) + 64:
+            self._heap = [
+                (priority, next(self._seq), name)
+                for name, priority in self._priorities.items()
+            ]
+            heapq.heapify(self._heap)
+            
+    def _is_pinned(self, cache_name: str) -> bool:
+        """Una entrada está fijada explícitamente o porque otras dependen de ella."""
+        return cache_name in self._pinned or bool(self._dependents.get(cache_name))
+        
+    def _remove_entry(self, cache_name: str, metadata: CacheMetadata):
+        """Elimina el archivo, el blob si queda huérfano y los metadatos de una entrada."""
+        cache_path = self.cache_path / cache_name
+        if cache_path.exists():
+            cache_path.unlink()
+        self.blob_store.release(metadata.hash)
+        self._unindex_entry(cache_name, metadata)
+        self.validator.fingerprints.pop(cache_name, None)
+        del self.metadata[cache_name]
+        
+    def _enforce_budget(self, protect: Optional[str] = None):
+        """Expulsa entradas hasta respetar el presupuesto de bytes."""
+        if self.max_size is None:
+            return
+            
+        skipped = []
+        while self.stored_size > self.max_size and self._heap:
+            priority, seq, cache_name = heapq.heappop(self._heap)
+            if self._priorities.get(cache_name) != priority:
+                continue
+            if cache_name == protect or self._is_pinned(cache_name):
+                skipped.append((priority, seq, cache_name))
+                continue
+                
+            metadata = self.metadata.get(cache_name)
+            if metadata is None:
+                self._priorities.pop(cache_name, None)
+                continue
+                
+            self._remove_entry(cache_name, metadata)
+            self.eviction_policy.on_evict(priority)
+            self.evictions += 1
+            self.evicted_bytes += metadata.size
+            self.logger.info(f"Entrada expulsada de caché: {cache_name}")
+            
+        for item in skipped:
+            heapq.heappush(self._heap, item)
             
+    def pin(self, name: str, cache_type: str) -> bool:
+        """Fija una entrada para que no sea expulsada."""
+        cache_name = self._index.get((name, cache_type))
+        if cache_name is None:
+            return False
+        self._pinned.add(cache_name)
+        return True
+        
+    def unpin(self, name: str, cache_type: str) -> bool:
+        """Libera una entrada fijada."""
+        cache_name = self._index.get((name, cache_type))
+        if cache_name is None or cache_name not in self._pinned:
+            return False
+        self._pinned.discard(cache_name)
+        return True
+        
     def _calculate_hash(self, file_path: Path) -> str:
-        """Calcula el hash de un archivo."""
+        """Calcula el hash de un archivo mediante el servicio compartido."""
         try:
-            hasher = hashlib.sha256()
-            with open(file_path, 'rb') as f:
-                for chunk in iter(lambda: f.read(4096), b''):
-                    hasher.update(chunk)
-            return hasher.hexdigest()
+            return self.hasher.hash_file(file_path)
         except Exception as e:
             self.logger.error(f"Error al calcular hash de {file_path}: {e}")
             return ''
             
-    def _get_cache_info(self, file_path: Path) -> Optional[CacheMetadata]:
+    def _get_cache_info(self,
+                       file_path: Path,
+                       name: Optional[str] = None,
+                       file_hash: Optional[str] = None) -> Optional[CacheMetadata]:
         """Obtiene información detallada de un archivo en caché."""
         try:
             if not file_path.exists():
                 return None
                 
             # Obtener información básica
-            name = file_path.stem
+            name = name or file_path.stem
             cache_type = file_path.suffix[1:]  # Eliminar el punto
             size = file_path.stat().st_size
-            file_hash = self._calculate_hash(file_path)
+            if file_hash is None:
+                file_hash = self._calculate_hash(file_path)
             
             # Obtener timestamps
             created = datetime.fromtimestamp(file_path.stat().st_ctime).isoformat()
@@ -128,18 +290,25 @@ class CacheManager:
             if cache_type is None:
                 cache_type = file_path.suffix[1:]
                 
-            # Crear nombre de archivo en caché
-            cache_name = f"{file_path.stem}_{self._calculate_hash(file_path)}.{cache_type}"
-            cache_path = self.cache_path / cache_name
+            # Ingerir en el almacén de contenido (hash en una sola pasada)
+            digest, _, _ = self.blob_store.ingest(file_path)
             
-            # Copiar archivo a caché
-            shutil.copy2(file_path, cache_path)
+            # Crear nombre de archivo en caché enlazado al blob
+            cache_name = f"{file_path.stem}_{digest}.{cache_type}"
+            cache_path = self.cache_path / cache_name
+            if not cache_path.exists():
+                self.blob_store.link(digest, cache_path)
+            self.hasher.record(cache_path, {self.blob_store.algorithm: digest})
             
             # Obtener información de caché
-            metadata = self._get_cache_info(cache_path)
+            metadata = self._get_cache_info(cache_path, file_path.stem, digest)
             if metadata:
+                previous = self.metadata.get(cache_name)
+                if previous is not None:
+                    self._unindex_entry(cache_name, previous)
                 self.metadata[cache_name] = metadata
-                self._save_metadata()
+                self._index_entry(cache_name, metadata)
+                self._enforce_budget(protect=cache_name)
                 
             return cache_path
             
@@ -152,16 +321,20 @@ class CacheManager:
                       cache_type: str) -> Optional[Path]:
         """Obtiene un archivo de la caché."""
         try:
-            # Buscar en metadatos
-            for cache_name, metadata in self.metadata.items():
-                if metadata.name == name and metadata.type == cache_type:
-                    cache_path = self.cache_path / cache_name
-                    if cache_path.exists():
-                        # Actualizar metadatos
-                        metadata.last_accessed = datetime.now().isoformat()
-                        metadata.access_count += 1
-                        self._save_metadata()
-                        return cache_path
+            # Buscar en el índice
+            cache_name = self._index.get((name, cache_type))
+            if cache_name is not None:
+                cache_path = self.cache_path / cache_name
+                if cache_path.exists():
+                    # Actualizar metadatos
+                    metadata = self.metadata[cache_name]
+                    metadata.last_accessed = datetime.now().isoformat()
+                    metadata.access_count += 1
+                    self.metadata[cache_name] = metadata
+                    self._touch(cache_name, metadata)
+                    self.hits += 1
+                    return cache_path
+            self.misses += 1
             return None
             
         except Exception as e:
@@ -173,18 +346,18 @@ class CacheManager:
                          cache_type: str) -> bool:
         """Elimina un archivo de la caché."""
         try:
-            # Buscar en metadatos
-            for cache_name, metadata in self.metadata.items():
-                if metadata.name == name and metadata.type == cache_type:
-                    cache_path = self.cache_path / cache_name
-                    if cache_path.exists():
-                        # Eliminar archivo
-                        cache_path.unlink()
-                        # Eliminar metadatos
-                        del self.metadata[cache_name]
-                        self._save_metadata()
-                        return True
-            return False
+            # Buscar en el índice
+            cache_name = self._index.get((name, cache_type))
+            if cache_name is None:
+                return False
+                
+            cache_path = self.cache_path / cache_name
+            if not cache_path.exists():
+                return False
+                
+            # Eliminar archivo, blob huérfano y metadatos
+            self._remove_entry(cache_name, self.metadata[cache_name])
+            return True
             
         except Exception as e:
             self.logger.error(f"Error al eliminar de caché {name}.{cache_type}: {e}")
@@ -195,47 +368,63 @@ class CacheManager:
         try:
             count = 0
             # Eliminar archivos
-            for cache_name, metadata in list(self.metadata.items()):
-                if cache_type is None or metadata.type == cache_type:
-                    cache_path = self.cache_path / cache_name
-                    if cache_path.exists():
-                        cache_path.unlink()
-                        del self.metadata[cache_name]
-                        count += 1
-            self._save_metadata()
+            with self.metadata.batch():
+                for cache_name, metadata in list(self.metadata.items()):
+                    if cache_type is None or metadata.type == cache_type:
+                        cache_path = self.cache_path / cache_name
+                        if cache_path.exists():
+                            self._remove_entry(cache_name, metadata)
+                            count += 1
             return count
             
         except Exception as e:
             self.logger.error(f"Error al limpiar caché: {e}")
             return 0
             
-    def validate_cache(self) -> Dict[str, bool]:
+    def validate_cache(self,
+                       incremental: bool = True,
+                       sample_rate: Optional[float] = None,
+                       progress: Optional[Callable[[ValidationEvent], None]] = None) -> Dict[str, bool]:
         """Valida la integridad de la caché."""
         try:
             results = {
                 'total_files': len(self.metadata),
                 'valid_files': 0,
                 'invalid_files': 0,
-                'missing_files': 0
+                'missing_files': 0,
+                'rehashed_files': 0
             }
             
-            for cache_name, metadata in list(self.metadata.items()):
-                cache_path = self.cache_path / cache_name
-                if not cache_path.exists():
-                    results['missing_files'] += 1
-                    del self.metadata[cache_name]
-                    continue
-                    
-                # Verificar hash
-                current_hash = self._calculate_hash(cache_path)
-                if current_hash == metadata.hash:
-                    results['valid_files'] += 1
-                    metadata.is_valid = True
-                else:
-                    results['invalid_files'] += 1
-                    metadata.is_valid = False
-                    
-            self._save_metadata()
+            entries = [
+                (cache_name, self.cache_path / cache_name, metadata.hash)
+                for cache_name, metadata in self.metadata.items()
+            ]
+            
+            with self.metadata.batch():
+                for event in self.validator.validate(entries, incremental, sample_rate):
+                    if progress:
+                        progress(event)
+                    if event.rehashed:
+                        results['rehashed_files'] += 1
+                        
+                    metadata = self.metadata.get(event.key)
+                    if metadata is None:
+                        continue
+                    if event.status == 'missing':
+                        results['missing_files'] += 1
+                        self._remove_entry(event.key, metadata)
+                        continue
+                        
+                    # Actualizar estado de validez
+                    is_valid = event.status == 'valid'
+                    if is_valid:
+                        results['valid_files'] += 1
+                    else:
+                        results['invalid_files'] += 1
+                    if metadata.is_valid != is_valid:
+                        metadata.is_valid = is_valid
+                        self.metadata[event.key] = metadata
+                        
             return results
             
         except Exception as e:
@@ -248,6 +437,15 @@ class CacheManager:
             'total_files': len(self.metadata),
             'total_size': 0,
             'types': {},
+            'stored_size': self.stored_size,
+            'max_size': self.max_size,
+            'eviction_policy': self.eviction_policy.name,
+            'pinned_files': sum(1 for name in self._priorities if self._is_pinned(name)),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / (self.hits + self.misses) if self.hits + self.misses else 0.0,
+            'evictions': self.evictions,
+            'evicted_bytes': self.evicted_bytes,
             'access_counts': {
                 '0-10': 0,
                 '11-50': 0,
@@ -0,0 +1,259 @@
+import os
+import sys
+import struct
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Union
+
+# Cabecera del snapshot binario: magia, versión, nodos, bytes de nombres, aristas
+SNAPSHOT_MAGIC = b'WVDG'
+SNAPSHOT_VERSION = 1
+_SNAPSHOT_HEADER = struct.Struct('<4sIQQQ')
+
+# Compactar el delta cuando supera esta fracción de la base
+COMPACT_RATIO = 0.25
+COMPACT_MIN_DELTA = 4096
+
+class CSRAdjacency:
+    """Adyacencia CSR (offsets + destinos ordenados) con un delta mutable encima.
+
+    La base ocupa 4 bytes por arista más 8 por nodo. Las altas y bajas se
+    acumulan en el delta hasta que `compact` las integra en la base.
+    """
+
+    def __init__(self, offsets: Optional[array] = None, targets: Optional[array] = None):
+        self.offsets = offsets if offsets is not None else array('Q', [0])
+        self.targets = targets if targets is not None else array('I')
+        self.added: Dict[int, Set[int]] = {}
+        self.removed: Dict[int, Set[int]] = {}
+        self.delta = 0
+
+    def _row(self, u: int):
+        """Rango [lo, hi) de la fila de un nodo en la base."""
+        if u + 1 >= len(self.offsets):
+            return 0, 0
+        return self.offsets[u], self.offsets[u + 1]
+
+    def _in_base(self, u: int, v: int) -> bool:
+        """Búsqueda binaria de v en la fila base de u."""
+        lo, hi = self._row(u)
+        i = bisect_left(self.targets, v, lo, hi)
+        return i < hi and self.targets[i] == v
+
+    def contains(self, u: int, v: int) -> bool:
+        """Indica si existe la arista u -> v."""
+        added = self.added.get(u)
+        if added and v in added:
+            return True
+        removed = self.removed.get(u)
+        if removed and v in removed:
+            return False
+        return self._in_base(u, v)
+
+    def neighbors(self, u: int) -> Iterator[int]:
+        """Itera los vecinos de un nodo."""
+        lo, hi = self._row(u)
+        removed = self.removed.get(u)
+        targets = self.targets
+        if removed:
+            for i in range(lo, hi):
+                if targets[i] not in removed:
+                    yield targets[i]
+        else:
+            yield from targets[lo:hi]
+        added = self.added.get(u)
+        if added:
+            yield from added
+
+    def has_neighbors(self, u: int) -> bool:
+        """Indica si un nodo tiene algún vecino."""
+        return next(iter(self.neighbors(u)), None) is not None
+
+    def add(self, u: int, v: int) -> bool:
+        """Añade la arista u -> v. Devuelve False si ya existía."""
+        removed = self.removed.get(u)
+        if removed and v in removed:
+            removed.discard(v)
+            if not removed:
+                del self.removed[u]
+            self.delta -= 1
+            return True
+        if self.contains(u, v):
+            return False
+        self.added.setdefault(u, set()).add(v)
+        self.delta += 1
+        return True
+
+    def remove(self, u: int, v: int) -> bool:
+        """Elimina la arista u -> v. Devuelve False si no existía."""
+        added = self.added.get(u)
+        if added and v in added:
+            added.discard(v)
+            if not added:
+                del self.added[u]
+            self.delta -= 1
+            return True
+        removed = self.removed.get(u)
+        if (removed and v in removed) or not self._in_base(u, v):
+            return False
+        self.removed.setdefault(u, set()).add(v)
+        self.delta += 1
+        return True
+
+    def needs_compaction(self) -> bool:
+        """Indica si el delta es lo bastante grande como para compactar."""
+        return self.delta > max(COMPACT_MIN_DELTA, len(self.targets) * COMPACT_RATIO)
+
+    def compact(self, node_count: int):
+        """Integra el delta en una base CSR nueva."""
+        offsets = array('Q', [0])
+        targets = array('I')
+        for u in range(node_count):
+            if u in self.added or u in self.removed:
+                targets.extend(sorted(self.neighbors(u)))
+            else:
+                lo, hi = self._row(u)
+                targets.extend(self.targets[lo:hi])
+            offsets.append(len(targets))
+        self.offsets, self.targets = offsets, targets
+        self.added.clear()
+        self.removed.clear()
+        self.delta = 0
+
+    def nbytes(self) -> int:
+        """Bytes ocupados por la base."""
+        return self.offsets.itemsize * len(self.offsets) + self.targets.itemsize * len(self.targets)
+
+class CompactGraph:
+    """Almacén de grafo con nombres internados y adyacencia CSR en ambos sentidos.
+
+    Cada nombre recibe un identificador entero estable; las aristas se
+    guardan como enteros de 32 bits con semántica de conjunto. El grafo se
+    persiste en un snapshot binario que se carga sin parsear JSON.
+    """
+
+    def __init__(self):
+        self.names: List[Optional[str]] = []
+        self.ids: Dict[str, int] = {}
+        self.succ = CSRAdjacency()
+        self.pred = CSRAdjacency()
+        self.edge_count = 0
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.ids
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def intern(self, name: str) -> int:
+        """Obtiene (o asigna) el identificador de un nombre."""
+        node = self.ids.get(name)
+        if node is None:
+            node = len(self.names)
+            self.names.append(name)
+            self.ids[name] = node
+        return node
+
+    def id_of(self, name: str) -> Optional[int]:
+        """Identificador de un nombre, o None si no existe."""
+        return self.ids.get(name)
+
+    def name_of(self, node: int) -> str:
+        """Nombre de un identificador."""
+        return self.names[node]
+
+    def node_ids(self) -> Iterator[int]:
+        """Itera los identificadores de los nodos vivos."""
+        return iter(self.ids.values())
+
+    def has_edge(self, u: int, v: int) -> bool:
+        """Indica si existe la arista u -> v."""
+        return self.succ.contains(u, v)
+
+    def add_edge(self, u: int, v: int) -> bool:
+        """Añade la arista u -> v. Devuelve False si ya existía."""
+        if not self.succ.add(u, v):
+            return False
+        self.pred.add(v, u)
+        self.edge_count += 1
+        self._maybe_compact()
+        return True
+
+    def remove_edge(self, u: int, v: int) -> bool:
+        """Elimina la arista u -> v. Devuelve False si no existía."""
+        if not self.succ.remove(u, v):
+            return False
+        self.pred.remove(v, u)
+        self.edge_count -= 1
+        self._maybe_compact()
+        return True
+
+    def remove_node(self, name: str):
+        """Elimina un nodo y sus aristas; su identificador no se reutiliza."""
+        node = self.ids.pop(name, None)
+        if node is None:
+            return
+        for v in list(self.succ.neighbors(node)):
+            self.remove_edge(node, v)
+        for u in list(self.pred.neighbors(node)):
+            self.remove_edge(u, node)
+        self.names[node] = None
+
+    def _maybe_compact(self):
+        """Compacta las adyacencias cuando el delta crece demasiado."""
+        if self.succ.needs_compaction() or self.pred.needs_compaction():
+            self.compact()
+
+    def compact(self):
+        """Integra todos los cambios pendientes en la base CSR."""
+        self.succ.compact(len(self.names))
+        self.pred.compact(len(self.names))
+
+    def nbytes(self) -> int:
+        """Bytes ocupados por la adyacencia base (sin nombres)."""
+        return self.succ.nbytes() + self.pred.nbytes()
+
+    def save(self, path: Union[str, Path]):
+        """Escribe el grafo en un snapshot binario (de forma atómica)."""
+        self.compact()
+        path = Path(path)
+        names = b'\0'.join((name or '').encode('utf-8') for name in self.names)
+        tmp_path = path.with_suffix(path.suffix + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(_SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION,
+                                          len(self.names), len(names), self.edge_count))
+            f.write(names)
+            for adjacency in (self.succ, self.pred):
+                for data in (adjacency.offsets, adjacency.targets):
+                    if sys.byteorder != 'little':
+                        data = array(data.typecode, data)
+                        data.byteswap()
+                    data.tofile(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'CompactGraph':
+        """Carga un grafo desde un snapshot binario."""
+        graph = cls()
+        with open(path, 'rb') as f:
+            magic, version, node_count, names_size, edge_count = _SNAPSHOT_HEADER.unpack(
+                f.read(_SNAPSHOT_HEADER.size))
+            if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+                raise ValueError(f"Snapshot de grafo no válido: {path}")
+            names = f.read(names_size).decode('utf-8').split('\0') if node_count else []
+            graph.names = [name or None for name in names]
+            graph.ids = {name: node for node, name in enumerate(graph.names) if name is not None}
+            for adjacency in (graph.succ, graph.pred):
+                offsets = array('Q')
+                offsets.fromfile(f, node_count + 1)
+                targets = array('I')
+                targets.fromfile(f, edge_count)
+                if sys.byteorder != 'little':
+                    offsets.byteswap()
+                    targets.byteswap()
+                adjacency.offsets, adjacency.targets = offsets, targets
+        graph.edge_count = edge_count
+        return graph
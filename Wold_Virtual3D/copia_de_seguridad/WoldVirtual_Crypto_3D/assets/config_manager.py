@@ -4,6 +4,7 @@ import logging
 from pathlib import Path
 from typing import Dict, List, Optional, Union, Tuple
 from dataclasses import dataclass
+from .metadata_store import MetadataStore, MetadataTable, open_metadata_table
 
 # Configuración de logging
 logging.basicConfig(
@@ -29,37 +30,33 @@ class ConfigMetadata:
 class ConfigManager:
     """Gestor de configuraciones."""
     
-    def __init__(self, base_path: str = "assets/configs"):
+    def __init__(self,
+                 base_path: str = "assets/configs",
+                 metadata_store: Optional[MetadataStore] = None):
         self.base_path = Path(base_path)
         self.metadata_path = self.base_path / "metadata"
         self.cache_path = self.base_path / "cache"
         self.logger = logging.getLogger("ConfigManager")
+        self.metadata_store = metadata_store
         
         # Crear directorios necesarios
         self.metadata_path.mkdir(parents=True, exist_ok=True)
         self.cache_path.mkdir(parents=True, exist_ok=True)
         
         # Cargar metadatos existentes
-        self.metadata: Dict[str, ConfigMetadata] = self._load_metadata()
+        self.metadata: MetadataTable = self._load_metadata()
         
-    def _load_metadata(self) -> Dict[str, ConfigMetadata]:
-        """Carga los metadatos de configuraciones desde el archivo JSON."""
-        metadata_file = self.metadata_path / "configs_metadata.json"
-        if metadata_file.exists():
-            with open(metadata_file, 'r') as f:
-                data = json.load(f)
-                return {k: ConfigMetadata(**v) for k, v in data.items()}
-        return {}
+    def _load_metadata(self) -> MetadataTable:
+        """Abre la tabla de metadatos de configuraciones en el almacén compartido."""
+        return open_metadata_table(
+            self.metadata_path / "configs_metadata.json",
+            ConfigMetadata,
+            self.metadata_store
+        )
         
-    def _save_metadata(self):
-        """Guarda los metadatos de configuraciones en el archivo JSON."""
-        metadata_file = self.metadata_path / "configs_metadata.json"
-        with open(metadata_file, 'w') as f:
-            json.dump(
-                {k: v.__dict__ for k, v in self.metadata.items()},
-                f,
-                indent=2
-            )
+    def _save_metadata(self, *keys: str):
+        """Persiste los metadatos de configuraciones modificados."""
+        self.metadata.save(*keys)
             
     def _get_config_info(self, file_path: Path) -> Optional[ConfigMetadata]:
         """Obtiene información detallada de una configuración."""
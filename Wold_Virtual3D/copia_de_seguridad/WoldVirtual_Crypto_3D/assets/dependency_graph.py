@@ -0,0 +1,252 @@
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Union
+from .compact_graph import CompactGraph, CSRAdjacency
+
+class DependencyGraph:
+    """Grafo dirigido de dependencias (nodo -> sus dependencias).
+
+    Los nodos se internan como enteros sobre un `CompactGraph` (adyacencia
+    CSR en ambos sentidos), y todos los recorridos son iterativos, por lo
+    que la profundidad del grafo no está limitada por el límite de
+    recursión de Python. Los cierres transitivos consultados se memorizan
+    y, al cambiar una arista u -> v, solo se invalidan los de los nodos
+    afectados: los ancestros de u (sus descendientes cambian) y los
+    descendientes de v (sus ancestros cambian).
+    """
+
+    def __init__(self, store: Optional[CompactGraph] = None):
+        self.store = store if store is not None else CompactGraph()
+        self._descendants: Dict[int, Set[int]] = {}
+        self._ancestors: Dict[int, Set[int]] = {}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.store
+
+    def __len__(self) -> int:
+        return len(self.store)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'DependencyGraph':
+        """Carga un grafo desde un snapshot binario."""
+        return cls(CompactGraph.load(path))
+
+    def save(self, path: Union[str, Path]):
+        """Guarda el grafo en un snapshot binario."""
+        self.store.save(path)
+
+    def _names(self, nodes: Iterable[int]) -> Set[str]:
+        """Traduce identificadores a nombres."""
+        name_of = self.store.names
+        return {name_of[node] for node in nodes}
+
+    def nodes(self) -> Iterator[str]:
+        """Itera los nodos del grafo."""
+        return iter(self.store.ids)
+
+    def edge_count(self) -> int:
+        """Número de aristas del grafo."""
+        return self.store.edge_count
+
+    def add_node(self, name: str):
+        """Añade un nodo sin aristas si no existe."""
+        self.store.intern(name)
+
+    def dependencies(self, name: str) -> Set[str]:
+        """Dependencias directas de un nodo."""
+        node = self.store.id_of(name)
+        return set() if node is None else self._names(self.store.succ.neighbors(node))
+
+    def dependents(self, name: str) -> Set[str]:
+        """Dependientes directos de un nodo."""
+        node = self.store.id_of(name)
+        return set() if node is None else self._names(self.store.pred.neighbors(node))
+
+    def has_edge(self, name: str, dependency: str) -> bool:
+        """Indica si existe la arista nombre -> dependencia."""
+        u, v = self.store.id_of(name), self.store.id_of(dependency)
+        return u is not None and v is not None and self.store.has_edge(u, v)
+
+    def add_edge(self, name: str, dependency: str) -> bool:
+        """Añade la arista nombre -> dependencia. Devuelve False si ya existía."""
+        u, v = self.store.intern(name), self.store.intern(dependency)
+        if self.store.has_edge(u, v):
+            return False
+        self._invalidate(u, v)
+        return self.store.add_edge(u, v)
+
+    def remove_edge(self, name: str, dependency: str) -> bool:
+        """Elimina la arista nombre -> dependencia. Devuelve False si no existía."""
+        u, v = self.store.id_of(name), self.store.id_of(dependency)
+        if u is None or v is None or not self.store.has_edge(u, v):
+            return False
+        self._invalidate(u, v)
+        return self.store.remove_edge(u, v)
+
+    def set_dependencies(self, name: str, dependencies: Iterable[str]):
+        """Sustituye las dependencias directas de un nodo."""
+        self.add_node(name)
+        dependencies = set(dependencies)
+        current = self.dependencies(name)
+        for dependency in current - dependencies:
+            self.remove_edge(name, dependency)
+        for dependency in dependencies - current:
+            self.add_edge(name, dependency)
+
+    def remove_node(self, name: str):
+        """Elimina un nodo y todas sus aristas."""
+        node = self.store.id_of(name)
+        if node is None:
+            return
+        for dependency in self.dependencies(name):
+            self.remove_edge(name, dependency)
+        for dependent in self.dependents(name):
+            self.remove_edge(dependent, name)
+        self.store.remove_node(name)
+        self._descendants.pop(node, None)
+        self._ancestors.pop(node, None)
+
+    def _reachable(self, start: int, adjacency: CSRAdjacency) -> Set[int]:
+        """Conjunto alcanzable desde un nodo (sin incluirlo salvo por un ciclo)."""
+        seen: Set[int] = set()
+        stack = list(adjacency.neighbors(start))
+        while stack:
+            node = stack.pop()
+            if node in seen:
+                continue
+            seen.add(node)
+            stack.extend(n for n in adjacency.neighbors(node) if n not in seen)
+        return seen
+
+    def _invalidate(self, u: int, v: int):
+        """Invalida los cierres afectados por un cambio en la arista u -> v."""
+        if self._descendants:
+            for node in self._reachable(u, self.store.pred) | {u}:
+                self._descendants.pop(node, None)
+        if self._ancestors:
+            for node in self._reachable(v, self.store.succ) | {v}:
+                self._ancestors.pop(node, None)
+
+    def _closure(self, start: int, adjacency: CSRAdjacency, cache: Dict[int, Set[int]]) -> Set[int]:
+        """Cierre transitivo memorizado, reutilizando los cierres ya calculados."""
+        cached = cache.get(start)
+        if cached is not None:
+            return cached
+        result: Set[int] = set()
+        stack = list(adjacency.neighbors(start))
+        while stack:
+            node = stack.pop()
+            if node in result:
+                continue
+            result.add(node)
+            known = cache.get(node)
+            if known is not None:
+                result |= known
+            else:
+                stack.extend(n for n in adjacency.neighbors(node) if n not in result)
+        cache[start] = result
+        return result
+
+    def descendants(self, name: str) -> Set[str]:
+        """Todas las dependencias transitivas de un nodo."""
+        node = self.store.id_of(name)
+        if node is None:
+            return set()
+        return self._names(self._closure(node, self.store.succ, self._descendants))
+
+    def ancestors(self, name: str) -> Set[str]:
+        """Todos los dependientes transitivos de un nodo."""
+        node = self.store.id_of(name)
+        if node is None:
+            return set()
+        return self._names(self._closure(node, self.store.pred, self._ancestors))
+
+    def reaches(self, source: str, target: str) -> bool:
+        """Indica si `target` es dependencia transitiva de `source`."""
+        u, t = self.store.id_of(source), self.store.id_of(target)
+        if u is None or t is None or not self.store.pred.has_neighbors(t):
+            return False
+        cached = self._descendants.get(u)
+        if cached is not None:
+            return t in cached
+        succ = self.store.succ
+        seen: Set[int] = set()
+        stack = list(succ.neighbors(u))
+        while stack:
+            node = stack.pop()
+            if node == t:
+                return True
+            if node in seen:
+                continue
+            seen.add(node)
+            known = self._descendants.get(node)
+            if known is not None:
+                if t in known:
+                    return True
+                continue
+            stack.extend(succ.neighbors(node))
+        return False
+
+    def would_create_cycle(self, name: str, dependencies: Iterable[str]) -> bool:
+        """Indica si añadir nombre -> dependencias cerraría un ciclo."""
+        return any(dep == name or self.reaches(dep, name) for dep in dependencies)
+
+    def strongly_connected_components(self, nodes: Optional[Iterable[str]] = None) -> List[List[str]]:
+        """Componentes fuertemente conexas (Tarjan iterativo), en orden topológico inverso."""
+        succ = self.store.succ
+        index: Dict[int, int] = {}
+        lowlink: Dict[int, int] = {}
+        on_stack: Set[int] = set()
+        stack: List[int] = []
+        components: List[List[str]] = []
+        counter = 0
+
+        if nodes is None:
+            roots = list(self.store.node_ids())
+        else:
+            roots = [self.store.id_of(name) for name in nodes if name in self.store]
+
+        for root in roots:
+            if root in index:
+                continue
+            index[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(succ.neighbors(root)))]
+            while work:
+                node, children = work[-1]
+                advanced = False
+                for child in children:
+                    if child not in index:
+                        index[child] = lowlink[child] = counter
+                        counter += 1
+                        stack.append(child)
+                        on_stack.add(child)
+                        work.append((child, iter(succ.neighbors(child))))
+                        advanced = True
+                        break
+                    if child in on_stack:
+                        lowlink[node] = min(lowlink[node], index[child])
+                if advanced:
+                    continue
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(self.store.names[member])
+                        if member == node:
+                            break
+                    components.append(component)
+        return components
+
+    def find_cycles(self) -> List[List[str]]:
+        """Componentes que forman ciclos (más de un nodo o un auto-bucle)."""
+        return [
+            component for component in self.strongly_connected_components()
+            if len(component) > 1 or self.has_edge(component[0], component[0])
+        ]
@@ -1,9 +1,13 @@
 import os
 import json
 import logging
+import threading
 from pathlib import Path
-from typing import Dict, List, Optional, Union, Set
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union, Set
 from dataclasses import dataclass
+from .metadata_store import MetadataStore, MetadataTable, open_metadata_table
+from .dependency_graph import DependencyGraph
+from .dependency_scheduler import ExecutionPlan, NodeResult, PlanResult, build_plan, execute_plan
 
 # Configuración de logging
 logging.basicConfig(
@@ -24,62 +28,103 @@ class DependencyMetadata:
     is_optional: bool
     is_circular: bool
 
+@dataclass
+class GraphSnapshotInfo:
+    """Estado del snapshot binario del grafo de dependencias."""
+    valid: bool
+    nodes: int
+    edges: int
+
 class DependencyManager:
     """Gestor de dependencias."""
     
-    def __init__(self, base_path: str = "assets/dependencies"):
+    def __init__(self,
+                 base_path: str = "assets/dependencies",
+                 metadata_store: Optional[MetadataStore] = None):
         self.base_path = Path(base_path)
         self.metadata_path = self.base_path / "metadata"
         self.logger = logging.getLogger("DependencyManager")
+        self.metadata_store = metadata_store
         
         # Crear directorios necesarios
         self.metadata_path.mkdir(parents=True, exist_ok=True)
         
         # Cargar metadatos existentes
-        self.metadata: Dict[str, DependencyMetadata] = self._load_metadata()
+        self.metadata: MetadataTable = self._load_metadata()
         
-    def _load_metadata(self) -> Dict[str, DependencyMetadata]:
-        """Carga los metadatos de dependencias desde el archivo JSON."""
-        metadata_file = self.metadata_path / "dependencies_metadata.json"
-        if metadata_file.exists():
-            with open(metadata_file, 'r') as f:
-                data = json.load(f)
-                return {k: DependencyMetadata(**v) for k, v in data.items()}
-        return {}
+        # Grafo en memoria con cierres memorizados (cargado desde snapshot si está al día)
+        self.snapshot_path = self.metadata_path / "dependency_graph.bin"
+        self.snapshot_info: MetadataTable = open_metadata_table(
+            self.metadata_path / "dependency_graph.json",
+            GraphSnapshotInfo,
+            self.metadata_store
+        )
+        self._snapshot_valid = False
+        self.graph = self._build_graph()
         
-    def _save_metadata(self):
-        """Guarda los metadatos de dependencias en el archivo JSON."""
-        metadata_file = self.metadata_path / "dependencies_metadata.json"
-        with open(metadata_file, 'w') as f:
-            json.dump(
-                {k: v.__dict__ for k, v in self.metadata.items()},
-                f,
-                indent=2
-            )
+    def _load_metadata(self) -> MetadataTable:
+        """Abre la tabla de metadatos de dependencias en el almacén compartido."""
+        return open_metadata_table(
+            self.metadata_path / "dependencies_metadata.json",
+            DependencyMetadata,
+            self.metadata_store
+        )
+        
+    def _save_metadata(self, *keys: str):
+        """Persiste los metadatos de dependencias modificados."""
+        self.metadata.save(*keys)
             
-    def _check_circular_dependency(self,
-                                 name: str,
-                                 dependencies: List[str],
-                                 visited: Set[str] = None) -> bool:
-        """Verifica si hay dependencias circulares."""
-        if visited is None:
-            visited = set()
+    def _build_graph(self) -> DependencyGraph:
+        """Carga el grafo desde el snapshot binario o lo reconstruye desde los metadatos."""
+        info = self.snapshot_info.get('snapshot')
+        if info is not None and info.valid and self.snapshot_path.exists():
+            try:
+                graph = DependencyGraph.load(self.snapshot_path)
+                self._snapshot_valid = True
+                return graph
+            except Exception as e:
+                self.logger.error(f"Error al cargar snapshot del grafo {self.snapshot_path}: {e}")
+                
+        graph = DependencyGraph()
+        for name, metadata in self.metadata.items():
+            graph.add_node(name)
+            for dep in metadata.dependencies:
+                graph.add_edge(name, dep)
+        self._write_snapshot(graph)
+        return graph
+        
+    def _write_snapshot(self, graph: DependencyGraph):
+        """Escribe el snapshot binario del grafo y lo marca como vigente."""
+        try:
+            graph.save(self.snapshot_path)
+            self.snapshot_info['snapshot'] = GraphSnapshotInfo(
+                valid=True,
+                nodes=len(graph),
+                edges=graph.edge_count()
+            )
+            self._snapshot_valid = True
+        except Exception as e:
+            self.logger.error(f"Error al guardar snapshot del grafo {self.snapshot_path}: {e}")
             
-        if name in visited:
-            return True
+    def _mark_graph_changed(self):
+        """Invalida el snapshot tras el primer cambio del grafo."""
+        if self._snapshot_valid:
+            info = self.snapshot_info.get('snapshot')
+            if info is not None:
+                info.valid = False
+                self.snapshot_info['snapshot'] = info
+            self._snapshot_valid = False
             
-        visited.add(name)
+    def save_graph_snapshot(self) -> bool:
+        """Guarda el grafo actual en el snapshot binario para cargas rápidas."""
+        self._write_snapshot(self.graph)
+        return self._snapshot_valid
         
-        for dep in dependencies:
-            if dep in self.metadata:
-                if self._check_circular_dependency(
-                    dep,
-                    self.metadata[dep].dependencies,
-                    visited.copy()
-                ):
-                    return True
-                    
-        return False
+    def _check_circular_dependency(self,
+                                 name: str,
+                                 dependencies: List[str]) -> bool:
+        """Verifica si añadir las dependencias a `name` cerraría un ciclo."""
+        return self.graph.would_create_cycle(name, dependencies)
         
     def register_dependency(self,
                           name: str,
@@ -102,21 +147,18 @@ class DependencyManager:
                 type=dep_type,
                 version=version,
                 dependencies=dependencies,
-                dependents=[],
+                dependents=[],  # Los dependientes se derivan del grafo
                 is_required=is_required,
                 is_optional=not is_required,
                 is_circular=is_circular
             )
             
-            # Actualizar dependientes
-            for dep in dependencies:
-                if dep in self.metadata:
-                    if name not in self.metadata[dep].dependents:
-                        self.metadata[dep].dependents.append(name)
-                        
-            # Guardar metadatos
+            # Guardar metadatos (cada arista se guarda una sola vez, en el origen)
             self.metadata[name] = metadata
-            self._save_metadata()
+            
+            # Actualizar el grafo
+            self._mark_graph_changed()
+            self.graph.set_dependencies(name, dependencies)
             
             return metadata
             
@@ -138,15 +180,11 @@ class DependencyManager:
                 return False
                 
             # Añadir dependencia
-            if dependency not in self.metadata[name].dependencies:
+            if not self.graph.has_edge(name, dependency):
+                self._mark_graph_changed()
+                self.graph.add_edge(name, dependency)
                 self.metadata[name].dependencies.append(dependency)
-                
-            # Actualizar dependientes
-            if dependency in self.metadata:
-                if name not in self.metadata[dependency].dependents:
-                    self.metadata[dependency].dependents.append(name)
-                    
-            self._save_metadata()
+                self._save_metadata(name)
             return True
             
         except Exception as e:
@@ -162,15 +200,11 @@ class DependencyManager:
                 return False
                 
             # Eliminar dependencia
-            if dependency in self.metadata[name].dependencies:
+            if self.graph.has_edge(name, dependency):
+                self._mark_graph_changed()
+                self.graph.remove_edge(name, dependency)
                 self.metadata[name].dependencies.remove(dependency)
-                
-            # Actualizar dependientes
-            if dependency in self.metadata:
-                if name in self.metadata[dependency].dependents:
-                    self.metadata[dependency].dependents.remove(name)
-                    
-            self._save_metadata()
+                self._save_metadata(name)
             return True
             
         except Exception as e:
@@ -188,13 +222,8 @@ class DependencyManager:
             if not recursive:
                 return self.metadata[name].dependencies
                 
-            # Obtener dependencias recursivamente
-            dependencies = set(self.metadata[name].dependencies)
-            for dep in self.metadata[name].dependencies:
-                if dep in self.metadata:
-                    dependencies.update(self.get_dependencies(dep, True))
-                    
-            return list(dependencies)
+            # Cierre transitivo memorizado
+            return list(self.graph.descendants(name) - {name})
             
         except Exception as e:
             self.logger.error(f"Error al obtener dependencias de {name}: {e}")
@@ -209,20 +238,42 @@ class DependencyManager:
                 return []
                 
             if not recursive:
-                return self.metadata[name].dependents
+                return list(self.graph.dependents(name))
                 
-            # Obtener dependientes recursivamente
-            dependents = set(self.metadata[name].dependents)
-            for dep in self.metadata[name].dependents:
-                if dep in self.metadata:
-                    dependents.update(self.get_dependents(dep, True))
-                    
-            return list(dependents)
+            # Cierre transitivo memorizado
+            return list(self.graph.ancestors(name) - {name})
             
         except Exception as e:
             self.logger.error(f"Error al obtener dependientes de {name}: {e}")
             return []
             
+    def find_cycles(self) -> List[List[str]]:
+        """Obtiene los ciclos de dependencias (componentes fuertemente conexas)."""
+        try:
+            return self.graph.find_cycles()
+            
+        except Exception as e:
+            self.logger.error(f"Error al buscar ciclos de dependencias: {e}")
+            return []
+            
+    def plan_load(self, roots: Iterable[str]) -> ExecutionPlan:
+        """Calcula los niveles topológicos para cargar unas raíces y sus dependencias."""
+        plan = build_plan(self.graph, roots)
+        for cycle in plan.cycles:
+            self.logger.warning(f"Ciclo de dependencias en el plan de carga: {cycle}")
+        return plan
+        
+    def execute_plan(self,
+                     plan: Union[ExecutionPlan, Iterable[str]],
+                     loader: Callable[[str], Any],
+                     max_workers: int = 4,
+                     cancel_event: Optional[threading.Event] = None,
+                     progress: Optional[Callable[[NodeResult], None]] = None) -> PlanResult:
+        """Ejecuta un plan (o lo calcula a partir de unas raíces) con un pool acotado."""
+        if not isinstance(plan, ExecutionPlan):
+            plan = self.plan_load(plan)
+        return execute_plan(plan, loader, max_workers, cancel_event, progress)
+        
     def validate_dependencies(self,
                             name: str) -> Dict[str, bool]:
         """Valida las dependencias de un elemento."""
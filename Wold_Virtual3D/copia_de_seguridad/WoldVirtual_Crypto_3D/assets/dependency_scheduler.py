@@ -0,0 +1,177 @@
+import time
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from concurrent.futures import Future, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+from .dependency_graph import DependencyGraph
+
+@dataclass
+class ExecutionPlan:
+    """Plan de carga: niveles topológicos, dependencias primero.
+
+    Todo lo que hay en un mismo nivel puede cargarse a la vez. Los nodos de
+    un ciclo comparten nivel y se listan además en `cycles`.
+    """
+    levels: List[List[str]]
+    dependencies: Dict[str, Set[str]]
+    cycles: List[List[str]] = field(default_factory=list)
+
+    @property
+    def nodes(self) -> List[str]:
+        """Nodos del plan en orden de ejecución."""
+        return [name for level in self.levels for name in level]
+
+@dataclass
+class NodeResult:
+    """Resultado de ejecutar un nodo del plan."""
+    name: str
+    status: str
+    result: Any = None
+    error: Optional[str] = None
+    started: Optional[float] = None
+    duration: float = 0.0
+
+@dataclass
+class PlanResult:
+    """Resultado de ejecutar un plan completo."""
+    results: Dict[str, NodeResult]
+    cancelled: bool
+    duration: float
+
+    @property
+    def succeeded(self) -> bool:
+        """Indica si todos los nodos terminaron correctamente."""
+        return all(r.status == 'done' for r in self.results.values())
+
+def build_plan(graph: DependencyGraph, roots: Iterable[str]) -> ExecutionPlan:
+    """Calcula el plan por niveles para cargar unas raíces y sus dependencias."""
+    roots = [root for root in roots if root in graph]
+    nodes: Set[str] = set(roots)
+    for root in roots:
+        nodes |= graph.descendants(root)
+
+    # Condensar ciclos: los miembros de un ciclo no se esperan entre sí
+    cycles = []
+    component_of: Dict[str, int] = {}
+    for i, component in enumerate(graph.strongly_connected_components(nodes)):
+        for member in component:
+            component_of[member] = i
+        if len(component) > 1 or component[0] in graph.dependencies(component[0]):
+            cycles.append(component)
+
+    dependencies = {
+        name: {dep for dep in graph.dependencies(name) if component_of[dep] != component_of[name]}
+        for name in nodes
+    }
+
+    # Nivel = 1 + nivel máximo de las dependencias (Tarjan emite dependencias primero)
+    level_of: Dict[int, int] = {}
+    members: Dict[int, List[str]] = {}
+    for name in nodes:
+        members.setdefault(component_of[name], []).append(name)
+    for component in sorted(members):
+        level = 0
+        for name in members[component]:
+            for dep in dependencies[name]:
+                level = max(level, level_of[component_of[dep]] + 1)
+        level_of[component] = level
+
+    levels: List[List[str]] = []
+    for component, level in level_of.items():
+        while len(levels) <= level:
+            levels.append([])
+        levels[level].extend(sorted(members[component]))
+    for level in levels:
+        level.sort()
+    return ExecutionPlan(levels=levels, dependencies=dependencies, cycles=cycles)
+
+def execute_plan(plan: ExecutionPlan,
+                 loader: Callable[[str], Any],
+                 max_workers: int = 4,
+                 cancel_event: Optional[threading.Event] = None,
+                 progress: Optional[Callable[[NodeResult], None]] = None,
+                 executor: Optional[ThreadPoolExecutor] = None) -> PlanResult:
+    """Ejecuta un plan con un pool acotado, lanzando cada nodo en cuanto sus dependencias terminan.
+
+    Un nodo cuya dependencia falla (o devuelve None) se marca como 'skipped'.
+    Activar `cancel_event` deja de lanzar nodos nuevos; los pendientes se
+    marcan como 'cancelled'.
+    """
+    logger = logging.getLogger("DependencyScheduler")
+    start = time.perf_counter()
+    results: Dict[str, NodeResult] = {}
+    remaining = {name: len(deps) for name, deps in plan.dependencies.items()}
+    dependents: Dict[str, List[str]] = {}
+    for name, deps in plan.dependencies.items():
+        for dep in deps:
+            dependents.setdefault(dep, []).append(name)
+
+    ready = deque(name for name in plan.nodes if remaining[name] == 0)
+    running: Dict[Future, str] = {}
+    own_executor = executor is None
+    if own_executor:
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def run(name: str) -> NodeResult:
+        node_start = time.perf_counter()
+        try:
+            value = loader(name)
+        except Exception as e:
+            return NodeResult(name, 'failed', None, str(e), node_start, time.perf_counter() - node_start)
+        status = 'done' if value is not None else 'failed'
+        return NodeResult(name, status, value, None, node_start, time.perf_counter() - node_start)
+
+    def finish(result: NodeResult):
+        results[result.name] = result
+        if progress:
+            progress(result)
+
+    def skip(name: str):
+        # Marca como omitidos todos los dependientes transitivos no ejecutados
+        stack = [name]
+        while stack:
+            for dependent in dependents.get(stack.pop(), ()):
+                if dependent not in results:
+                    finish(NodeResult(dependent, 'skipped', error=f"Dependencia fallida: {name}"))
+                    stack.append(dependent)
+
+    cancelled = False
+    try:
+        while ready or running:
+            if cancel_event is not None and cancel_event.is_set():
+                cancelled = True
+                break
+            while ready and len(running) < max_workers:
+                name = ready.popleft()
+                if name not in results:
+                    running[executor.submit(run, name)] = name
+            if not running:
+                continue
+            done, _ = wait(list(running), timeout=0.1, return_when=FIRST_COMPLETED)
+            for future in done:
+                running.pop(future)
+                result = future.result()
+                finish(result)
+                if result.status != 'done':
+                    logger.warning(f"Fallo al ejecutar {result.name}: {result.error}")
+                    skip(result.name)
+                    continue
+                for dependent in dependents.get(result.name, ()):
+                    remaining[dependent] -= 1
+                    if remaining[dependent] == 0 and dependent not in results:
+                        ready.append(dependent)
+    finally:
+        for future, name in running.items():
+            if future.cancel():
+                finish(NodeResult(name, 'cancelled'))
+            else:
+                finish(future.result())
+        for name in plan.nodes:
+            if name not in results:
+                finish(NodeResult(name, 'cancelled'))
+        if own_executor:
+            executor.shutdown(wait=True)
+
+    return PlanResult(results=results, cancelled=cancelled, duration=time.perf_counter() - start)
@@ -5,6 +5,7 @@ from pathlib import Path
 from typing import Dict, List, Optional, Union, Any, Callable
 from dataclasses import dataclass
 from datetime import datetime
+from .metadata_store import MetadataStore, MetadataTable, open_metadata_table
 
 # Configuración de logging
 logging.basicConfig(
@@ -29,39 +30,35 @@ class EventMetadata:
 class EventManager:
     """Gestor de eventos."""
     
-    def __init__(self, base_path: str = "assets/events"):
+    def __init__(self,
+                 base_path: str = "assets/events",
+                 metadata_store: Optional[MetadataStore] = None):
         self.base_path = Path(base_path)
         self.metadata_path = self.base_path / "metadata"
         self.logger = logging.getLogger("EventManager")
+        self.metadata_store = metadata_store
         
         # Crear directorios necesarios
         self.base_path.mkdir(parents=True, exist_ok=True)
         self.metadata_path.mkdir(parents=True, exist_ok=True)
         
         # Cargar metadatos existentes
-        self.metadata: Dict[str, EventMetadata] = self._load_metadata()
+        self.metadata: MetadataTable = self._load_metadata()
         
         # Registro de manejadores
         self.handlers: Dict[str, List[Callable]] = {}
         
-    def _load_metadata(self) -> Dict[str, EventMetadata]:
-        """Carga los metadatos de eventos desde el archivo JSON."""
-        metadata_file = self.metadata_path / "events_metadata.json"
-        if metadata_file.exists():
-            with open(metadata_file, 'r') as f:
-                data = json.load(f)
-                return {k: EventMetadata(**v) for k, v in data.items()}
-        return {}
+    def _load_metadata(self) -> MetadataTable:
+        """Abre la tabla de metadatos de eventos en el almacén compartido."""
+        return open_metadata_table(
+            self.metadata_path / "events_metadata.json",
+            EventMetadata,
+            self.metadata_store
+        )
         
-    def _save_metadata(self):
-        """Guarda los metadatos de eventos en el archivo JSON."""
-        metadata_file = self.metadata_path / "events_metadata.json"
-        with open(metadata_file, 'w') as f:
-            json.dump(
-                {k: v.__dict__ for k, v in self.metadata.items()},
-                f,
-                indent=2
-            )
+    def _save_metadata(self, *keys: str):
+        """Persiste los metadatos de eventos modificados."""
+        self.metadata.save(*keys)
             
     def register_event(self,
                       name: str,
@@ -156,7 +153,7 @@ class EventManager:
             metadata = self.metadata[event_name]
             metadata.last_triggered = datetime.now().isoformat()
             metadata.trigger_count += 1
-            self._save_metadata()
+            self._save_metadata(event_name)
             
             # Ejecutar manejadores
             for handler in self.handlers[event_name]:
@@ -0,0 +1,68 @@
+from typing import Any, Dict, Tuple, Type, Union
+
+# Prioridad de expulsión: se expulsa antes la entrada con menor valor
+Priority = Tuple[float, float]
+
+class EvictionPolicy:
+    """Política de expulsión base para la caché."""
+
+    name = 'base'
+
+    def priority(self, metadata: Any, last_access: float) -> Priority:
+        """Calcula la prioridad de permanencia de una entrada."""
+        raise NotImplementedError
+
+    def on_evict(self, priority: Priority):
+        """Notifica la expulsión de una entrada con la prioridad dada."""
+        pass
+
+class LRUPolicy(EvictionPolicy):
+    """Expulsa primero la entrada usada hace más tiempo."""
+
+    name = 'lru'
+
+    def priority(self, metadata: Any, last_access: float) -> Priority:
+        return (last_access, 0.0)
+
+class LFUPolicy(EvictionPolicy):
+    """Expulsa primero la entrada con menos accesos (`access_count`)."""
+
+    name = 'lfu'
+
+    def priority(self, metadata: Any, last_access: float) -> Priority:
+        return (float(metadata.access_count), last_access)
+
+class GDSFPolicy(EvictionPolicy):
+    """Greedy-Dual-Size-Frequency: favorece entradas pequeñas y frecuentes.
+
+    La prioridad es `L + frecuencia * coste / tamaño`, donde `L` se infla con
+    la prioridad de cada entrada expulsada para envejecer las antiguas.
+    """
+
+    name = 'gdsf'
+
+    def __init__(self, cost: float = 1.0):
+        self.cost = cost
+        self.inflation = 0.0
+
+    def priority(self, metadata: Any, last_access: float) -> Priority:
+        frequency = metadata.access_count + 1
+        return (self.inflation + frequency * self.cost / max(metadata.size, 1), last_access)
+
+    def on_evict(self, priority: Priority):
+        self.inflation = max(self.inflation, priority[0])
+
+EVICTION_POLICIES: Dict[str, Type[EvictionPolicy]] = {
+    'lru': LRUPolicy,
+    'lfu': LFUPolicy,
+    'gdsf': GDSFPolicy
+}
+
+def get_eviction_policy(policy: Union[str, EvictionPolicy]) -> EvictionPolicy:
+    """Obtiene una política de expulsión por nombre o la devuelve tal cual."""
+    if isinstance(policy, EvictionPolicy):
+        return policy
+    try:
+        return EVICTION_POLICIES[policy.lower()]()
+    except KeyError:
+        raise ValueError(f"Política de expulsión no soportada: {policy}")
@@ -0,0 +1,142 @@
+import os
+import mmap
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Union
+from .metadata_store import DEFAULT_METADATA_DB, MetadataTable, open_metadata_table
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+# Algoritmo por defecto: compatible con la cadena e IPFS
+DEFAULT_ALGORITHM = 'sha256'
+
+# Algoritmo rápido no criptográfico para deduplicación interna
+FAST_ALGORITHM = 'xxh3_128' if xxhash is not None else 'blake2b'
+
+# A partir de este tamaño se hashea con mmap en lugar de lecturas en bloque
+MMAP_THRESHOLD = 8 * 1024 * 1024
+READ_CHUNK_SIZE = 1024 * 1024
+
+def new_hasher(algorithm: str):
+    """Crea un objeto de hash para el algoritmo dado ('fast' elige el rápido)."""
+    if algorithm == 'fast':
+        algorithm = FAST_ALGORITHM
+    if algorithm.startswith('xxh'):
+        if xxhash is None:
+            raise ValueError(f"Algoritmo de hash no disponible (falta xxhash): {algorithm}")
+        return getattr(xxhash, algorithm)()
+    return hashlib.new(algorithm)
+
+def hash_file_digests(file_path: Union[str, Path],
+                      algorithms: Sequence[str] = (DEFAULT_ALGORITHM,)) -> Dict[str, str]:
+    """Calcula varios digests de un archivo en una sola pasada de lectura."""
+    hashers = {algorithm: new_hasher(algorithm) for algorithm in algorithms}
+    with open(file_path, 'rb', buffering=0) as f:
+        size = os.fstat(f.fileno()).st_size
+        if size >= MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for hasher in hashers.values():
+                    hasher.update(mm)
+        else:
+            buffer = bytearray(READ_CHUNK_SIZE)
+            view = memoryview(buffer)
+            while True:
+                n = f.readinto(buffer)
+                if not n:
+                    break
+                for hasher in hashers.values():
+                    hasher.update(view[:n])
+    return {algorithm: hasher.hexdigest() for algorithm, hasher in hashers.items()}
+
+def hash_file(file_path: Union[str, Path], algorithm: str = DEFAULT_ALGORITHM) -> str:
+    """Calcula el digest de un archivo (función apta para pools de procesos)."""
+    return hash_file_digests(file_path, (algorithm,))[algorithm]
+
+@dataclass
+class DigestCacheEntry:
+    """Digests calculados para una huella de archivo."""
+    digests: Dict[str, str]
+
+class HashingService:
+    """Servicio de hashing compartido con caché de digests por huella.
+
+    La caché se indexa por (dispositivo, inode, tamaño, mtime_ns): volver a
+    registrar un archivo sin cambios cuesta un stat() en lugar de leerlo.
+    """
+
+    def __init__(self,
+                 metadata_path: Path = DEFAULT_METADATA_DB.parent,
+                 metadata_store=None,
+                 algorithm: str = DEFAULT_ALGORITHM):
+        self.algorithm = algorithm
+        self.logger = logging.getLogger("HashingService")
+        self.cache: MetadataTable = open_metadata_table(
+            Path(metadata_path) / "digests.json",
+            DigestCacheEntry,
+            metadata_store
+        )
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _cache_key(self, file_path: Union[str, Path]) -> str:
+        """Clave de caché a partir de la huella del archivo."""
+        stat = os.stat(file_path)
+        return f"{stat.st_dev}:{stat.st_ino}:{stat.st_size}:{stat.st_mtime_ns}"
+
+    def hash_file_multi(self,
+                        file_path: Union[str, Path],
+                        algorithms: Optional[Sequence[str]] = None) -> Dict[str, str]:
+        """Obtiene varios digests de un archivo, leyéndolo como mucho una vez."""
+        algorithms = [
+            FAST_ALGORITHM if algorithm == 'fast' else algorithm
+            for algorithm in (algorithms or (self.algorithm,))
+        ]
+        key = self._cache_key(file_path)
+        with self._lock:
+            entry = self.cache.get(key)
+            missing = [a for a in algorithms if entry is None or a not in entry.digests]
+            if not missing:
+                self.hits += 1
+                return {a: entry.digests[a] for a in algorithms}
+            self.misses += 1
+
+        # Leer fuera del cerrojo para permitir hashes en paralelo
+        digests = hash_file_digests(file_path, missing)
+        with self._lock:
+            entry = self.cache.get(key) or DigestCacheEntry(digests={})
+            entry.digests.update(digests)
+            self.cache[key] = entry
+            return {a: entry.digests[a] for a in algorithms}
+
+    def hash_file(self, file_path: Union[str, Path], algorithm: Optional[str] = None) -> str:
+        """Obtiene el digest de un archivo con el algoritmo indicado."""
+        algorithm = algorithm or self.algorithm
+        digests = self.hash_file_multi(file_path, (algorithm,))
+        return next(iter(digests.values()))
+
+    def record(self, file_path: Union[str, Path], digests: Dict[str, str]):
+        """Registra digests ya calculados (p. ej. durante una copia)."""
+        key = self._cache_key(file_path)
+        with self._lock:
+            entry = self.cache.get(key) or DigestCacheEntry(digests={})
+            entry.digests.update(digests)
+            self.cache[key] = entry
+
+_services: Dict[object, HashingService] = {}
+_services_lock = threading.Lock()
+
+def get_hashing_service(metadata_store=None) -> HashingService:
+    """Obtiene el servicio de hashing compartido del proceso."""
+    with _services_lock:
+        service = _services.get(metadata_store)
+        if service is None:
+            service = HashingService(metadata_store=metadata_store)
+            _services[metadata_store] = service
+        return service
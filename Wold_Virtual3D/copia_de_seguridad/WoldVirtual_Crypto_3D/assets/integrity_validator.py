@@ -0,0 +1,162 @@
+import os
+import random
+import logging
+from pathlib import Path
+from dataclasses import dataclass
+from datetime import datetime
+from concurrent.futures import Executor, ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, Iterable, Iterator, Optional, Tuple, Union
+from .metadata_store import MetadataTable, open_metadata_table
+from .hashing import DEFAULT_ALGORITHM, hash_file
+
+@dataclass
+class FileFingerprint:
+    """Huella de un archivo y el hash calculado para ella."""
+    inode: int
+    size: int
+    mtime_ns: int
+    hash: str
+    verified: str
+
+@dataclass
+class ValidationEvent:
+    """Evento de progreso emitido por cada entrada validada."""
+    key: str
+    path: str
+    status: str
+    rehashed: bool
+    done: int
+    total: int
+
+def file_fingerprint(file_path: Union[str, Path]) -> Tuple[int, int, int]:
+    """Obtiene la huella (inode, tamaño, mtime_ns) de un archivo."""
+    stat = os.stat(file_path)
+    return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+class IntegrityValidator:
+    """Validador incremental de integridad basado en huellas de archivo.
+
+    Solo se vuelven a hashear los archivos cuya huella cambió desde la última
+    validación; el resto se da por válido salvo la fracción `sample_rate`,
+    que se comprueba igualmente. Los hashes se reparten en un pool de
+    procesos y los resultados se emiten como eventos a medida que terminan.
+    """
+
+    def __init__(self,
+                 metadata_path: Path,
+                 metadata_store=None,
+                 algorithm: str = DEFAULT_ALGORITHM,
+                 max_workers: Optional[int] = None,
+                 sample_rate: float = 0.0):
+        self.algorithm = algorithm
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.sample_rate = sample_rate
+        self.logger = logging.getLogger("IntegrityValidator")
+        self.fingerprints: MetadataTable = open_metadata_table(
+            metadata_path / "fingerprints.json",
+            FileFingerprint,
+            metadata_store
+        )
+
+    def _needs_rehash(self,
+                      key: str,
+                      fingerprint: Tuple[int, int, int],
+                      expected_hash: str,
+                      sample_rate: float) -> bool:
+        """Decide si una entrada debe volver a hashearse."""
+        stored = self.fingerprints.get(key)
+        if stored is None or stored.hash != expected_hash:
+            return True
+        if (stored.inode, stored.size, stored.mtime_ns) != fingerprint:
+            return True
+        return sample_rate > 0 and random.random() < sample_rate
+
+    def _record(self, key: str, fingerprint: Tuple[int, int, int], file_hash: str):
+        """Guarda la huella y el hash calculado de una entrada."""
+        self.fingerprints[key] = FileFingerprint(
+            inode=fingerprint[0],
+            size=fingerprint[1],
+            mtime_ns=fingerprint[2],
+            hash=file_hash,
+            verified=datetime.now().isoformat()
+        )
+
+    def check(self, key: str, file_path: Union[str, Path], expected_hash: str) -> str:
+        """Valida una sola entrada en el hilo actual. Devuelve el estado."""
+        try:
+            fingerprint = file_fingerprint(file_path)
+        except FileNotFoundError:
+            return 'missing'
+        if not self._needs_rehash(key, fingerprint, expected_hash, self.sample_rate):
+            return 'valid'
+        file_hash = hash_file(file_path, self.algorithm)
+        self._record(key, fingerprint, file_hash)
+        return 'valid' if file_hash == expected_hash else 'invalid'
+
+    def validate(self,
+                 entries: Iterable[Tuple[str, Union[str, Path], str]],
+                 incremental: bool = True,
+                 sample_rate: Optional[float] = None,
+                 executor: Optional[Executor] = None) -> Iterator[ValidationEvent]:
+        """Valida entradas (clave, ruta, hash esperado) emitiendo eventos de progreso."""
+        entries = list(entries)
+        total = len(entries)
+        sample_rate = self.sample_rate if sample_rate is None else sample_rate
+        done = 0
+        pending: Dict = {}
+        own_executor = None
+
+        try:
+            for key, file_path, expected_hash in entries:
+                file_path = str(file_path)
+                try:
+                    fingerprint = file_fingerprint(file_path)
+                except FileNotFoundError:
+                    done += 1
+                    yield ValidationEvent(key, file_path, 'missing', False, done, total)
+                    continue
+
+                if incremental and not self._needs_rehash(key, fingerprint, expected_hash, sample_rate):
+                    done += 1
+                    yield ValidationEvent(key, file_path, 'valid', False, done, total)
+                    continue
+
+                # Encolar el hash con un número acotado de tareas en vuelo
+                if executor is None:
+                    own_executor = executor = ProcessPoolExecutor(max_workers=self.max_workers)
+                future = executor.submit(hash_file, file_path, self.algorithm)
+                pending[future] = (key, file_path, expected_hash, fingerprint)
+
+                while len(pending) >= 2 * self.max_workers:
+                    for event in self._drain(pending, FIRST_COMPLETED):
+                        done += 1
+                        event.done, event.total = done, total
+                        yield event
+
+            while pending:
+                for event in self._drain(pending, FIRST_COMPLETED):
+                    done += 1
+                    event.done, event.total = done, total
+                    yield event
+
+        finally:
+            if own_executor is not None:
+                own_executor.shutdown(wait=True, cancel_futures=True)
+
+    def _drain(self, pending: Dict, return_when) -> Iterator[ValidationEvent]:
+        """Recoge los hashes terminados y emite sus eventos."""
+        finished, _ = wait(list(pending), return_when=return_when)
+        for future in finished:
+            key, file_path, expected_hash, fingerprint = pending.pop(future)
+            try:
+                file_hash = future.result()
+            except FileNotFoundError:
+                yield ValidationEvent(key, file_path, 'missing', True, 0, 0)
+                continue
+            except Exception as e:
+                self.logger.error(f"Error al hashear {file_path}: {e}")
+                yield ValidationEvent(key, file_path, 'invalid', True, 0, 0)
+                continue
+            self._record(key, fingerprint, file_hash)
+            status = 'valid' if file_hash == expected_hash else 'invalid'
+            yield ValidationEvent(key, file_path, status, True, 0, 0)
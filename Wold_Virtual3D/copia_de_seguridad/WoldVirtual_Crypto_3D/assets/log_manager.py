@@ -6,6 +6,7 @@ from pathlib import Path
 from typing import Dict, List, Optional, Union
 from dataclasses import dataclass
 from datetime import datetime
+from .metadata_store import MetadataStore, MetadataTable, open_metadata_table
 
 # Configuración de logging
 logging.basicConfig(
@@ -32,36 +33,32 @@ class LogMetadata:
 class LogManager:
     """Gestor de logs."""
     
-    def __init__(self, base_path: str = "assets/logs"):
+    def __init__(self,
+                 base_path: str = "assets/logs",
+                 metadata_store: Optional[MetadataStore] = None):
         self.base_path = Path(base_path)
         self.metadata_path = self.base_path / "metadata"
         self.logger = logging.getLogger("LogManager")
+        self.metadata_store = metadata_store
         
         # Crear directorios necesarios
         self.base_path.mkdir(parents=True, exist_ok=True)
         self.metadata_path.mkdir(parents=True, exist_ok=True)
         
         # Cargar metadatos existentes
-        self.metadata: Dict[str, LogMetadata] = self._load_metadata()
+        self.metadata: MetadataTable = self._load_metadata()
         
-    def _load_metadata(self) -> Dict[str, LogMetadata]:
-        """Carga los metadatos de logs desde el archivo JSON."""
-        metadata_file = self.metadata_path / "logs_metadata.json"
-        if metadata_file.exists():
-            with open(metadata_file, 'r') as f:
-                data = json.load(f)
-                return {k: LogMetadata(**v) for k, v in data.items()}
-        return {}
+    def _load_metadata(self) -> MetadataTable:
+        """Abre la tabla de metadatos de logs en el almacén compartido."""
+        return open_metadata_table(
+            self.metadata_path / "logs_metadata.json",
+            LogMetadata,
+            self.metadata_store
+        )
         
-    def _save_metadata(self):
-        """Guarda los metadatos de logs en el archivo JSON."""
-        metadata_file = self.metadata_path / "logs_metadata.json"
-        with open(metadata_file, 'w') as f:
-            json.dump(
-                {k: v.__dict__ for k, v in self.metadata.items()},
-                f,
-                indent=2
-            )
+    def _save_metadata(self, *keys: str):
+        """Persiste los metadatos de logs modificados."""
+        self.metadata.save(*keys)
             
     def _get_log_info(self, file_path: Path) -> Optional[LogMetadata]:
         """Obtiene información detallada de un archivo de log."""
@@ -7,6 +7,7 @@ import numpy as np
 from dataclasses import dataclass
 import trimesh
 from trimesh.visual import Material, TextureVisuals
+from .metadata_store import MetadataStore, MetadataTable, open_metadata_table
 
 # Configuración de logging
 logging.basicConfig(
@@ -32,37 +33,33 @@ class MaterialMetadata:
 class MaterialManager:
     """Gestor de materiales."""
     
-    def __init__(self, base_path: str = "assets/materials"):
+    def __init__(self,
+                 base_path: str = "assets/materials",
+                 metadata_store: Optional[MetadataStore] = None):
         self.base_path = Path(base_path)
         self.metadata_path = self.base_path / "metadata"
         self.cache_path = self.base_path / "cache"
         self.logger = logging.getLogger("MaterialManager")
+        self.metadata_store = metadata_store
         
         # Crear directorios necesarios
         self.metadata_path.mkdir(parents=True, exist_ok=True)
         self.cache_path.mkdir(parents=True, exist_ok=True)
         
         # Cargar metadatos existentes
-        self.metadata: Dict[str, MaterialMetadata] = self._load_metadata()
+        self.metadata: MetadataTable = self._load_metadata()
         
-    def _load_metadata(self) -> Dict[str, MaterialMetadata]:
-        """Carga los metadatos de materiales desde el archivo JSON."""
-        metadata_file = self.metadata_path / "materials_metadata.json"
-        if metadata_file.exists():
-            with open(metadata_file, 'r') as f:
-                data = json.load(f)
-                return {k: MaterialMetadata(**v) for k, v in data.items()}
-        return {}
+    def _load_metadata(self) -> MetadataTable:
+        """Abre la tabla de metadatos de materiales en el almacén compartido."""
+        return open_metadata_table(
+            self.metadata_path / "materials_metadata.json",
+            MaterialMetadata,
+            self.metadata_store
+        )
         
-    def _save_metadata(self):
-        """Guarda los metadatos de materiales en el archivo JSON."""
-        metadata_file = self.metadata_path / "materials_metadata.json"
-        with open(metadata_file, 'w') as f:
-            json.dump(
-                {k: v.__dict__ for k, v in self.metadata.items()},
-                f,
-                indent=2
-            )
+    def _save_metadata(self, *keys: str):
+        """Persiste los metadatos de materiales modificados."""
+        self.metadata.save(*keys)
             
     def _get_material_info(self, file_path: Path) -> Optional[MaterialMetadata]:
         """Obtiene información detallada de un material."""
@@ -0,0 +1,221 @@
+import os
+import json
+import time
+import atexit
+import logging
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple, Union
+
+class WriteBehindStore:
+    """Capa de escritura diferida sobre un almacén de metadatos.
+
+    Las mutaciones se acumulan en memoria (coalescidas por clave) y un hilo
+    en segundo plano las añade a un diario de solo anexado cada
+    `flush_interval` segundos o al alcanzar `max_pending` cambios. El diario
+    se compacta periódicamente sobre el almacén base, que actúa como
+    instantánea, y se reproduce al arrancar tras una caída.
+    """
+
+    def __init__(self,
+                 backend: Any,
+                 journal_path: Union[str, Path],
+                 flush_interval: float = 1.0,
+                 max_pending: int = 1000,
+                 compact_interval: float = 30.0,
+                 compact_threshold: int = 50000):
+        self.backend = backend
+        self.journal_path = Path(journal_path)
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.compact_interval = compact_interval
+        self.compact_threshold = compact_threshold
+        self.logger = logging.getLogger("WriteBehindStore")
+
+        # Cambios sin escribir en el diario y cambios ya en el diario
+        # pero aún no compactados en la instantánea (None = eliminado)
+        self._lock = threading.RLock()
+        self._pending: Dict[Tuple[str, str], Optional[str]] = {}
+        self._overlay: Dict[Tuple[str, str], Optional[str]] = {}
+        self._last_compaction = time.monotonic()
+
+        # Recuperar cambios de una ejecución anterior
+        self._replay_journal()
+        self._journal = open(self.journal_path, 'a', encoding='utf-8')
+
+        # Hilo de volcado
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run,
+            name="WriteBehindStore",
+            daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _replay_journal(self):
+        """Aplica sobre la instantánea los cambios pendientes del diario."""
+        if not self.journal_path.exists():
+            return
+        changes: Dict[Tuple[str, str], Optional[str]] = {}
+        with open(self.journal_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Última línea truncada por una caída
+                    self.logger.warning(f"Registro de diario incompleto ignorado en {self.journal_path}")
+                    break
+                changes[(record['n'], record['k'])] = record['v']
+        if changes:
+            self._apply(changes)
+            self.logger.info(f"Diario reproducido: {len(changes)} cambios")
+        self.journal_path.unlink()
+
+    def _apply(self, changes: Dict[Tuple[str, str], Optional[str]]):
+        """Aplica un lote de cambios a la instantánea en una transacción."""
+        with self.backend.batch():
+            for (namespace, key), value in changes.items():
+                if value is None:
+                    self.backend.delete(namespace, key)
+                else:
+                    self.backend.put(namespace, key, value)
+
+    def _run(self):
+        """Bucle del hilo de volcado."""
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+                if (len(self._overlay) >= self.compact_threshold or
+                        time.monotonic() - self._last_compaction >= self.compact_interval):
+                    self.compact()
+            except Exception as e:
+                self.logger.error(f"Error al volcar metadatos: {e}")
+
+    def flush(self):
+        """Escribe en el diario los cambios acumulados."""
+        with self._lock:
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, {}
+            self._journal.write(''.join(
+                json.dumps({'n': namespace, 'k': key, 'v': value}) + '\n'
+                for (namespace, key), value in pending.items()
+            ))
+            self._journal.flush()
+            os.fsync(self._journal.fileno())
+            self._overlay.update(pending)
+
+    def compact(self):
+        """Vuelca el diario sobre la instantánea y lo trunca."""
+        with self._lock:
+            self.flush()
+            if self._overlay:
+                self._apply(self._overlay)
+                self._overlay = {}
+            self._journal.truncate(0)
+            self._journal.seek(0)
+            self._last_compaction = time.monotonic()
+
+    def close(self):
+        """Detiene el hilo de volcado y compacta los cambios restantes."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._wakeup.set()
+        self._thread.join()
+        with self._lock:
+            self.compact()
+            self._journal.close()
+        self.backend.close()
+
+    def _lookup(self, namespace: str, key: str) -> Tuple[bool, Optional[str]]:
+        """Busca una clave en los cambios aún no compactados."""
+        item = (namespace, key)
+        if item in self._pending:
+            return True, self._pending[item]
+        if item in self._overlay:
+            return True, self._overlay[item]
+        return False, None
+
+    def _changes(self, namespace: str) -> Dict[str, Optional[str]]:
+        """Cambios no compactados de un espacio de nombres."""
+        changes = {k: v for (n, k), v in self._overlay.items() if n == namespace}
+        changes.update({k: v for (n, k), v in self._pending.items() if n == namespace})
+        return changes
+
+    @contextmanager
+    def batch(self):
+        """Las escrituras ya se agrupan en cada volcado."""
+        yield self
+
+    def get(self, namespace: str, key: str) -> Optional[str]:
+        """Obtiene el valor serializado de una clave."""
+        with self._lock:
+            found, value = self._lookup(namespace, key)
+        return value if found else self.backend.get(namespace, key)
+
+    def contains(self, namespace: str, key: str) -> bool:
+        """Verifica si existe una clave."""
+        with self._lock:
+            found, value = self._lookup(namespace, key)
+        return value is not None if found else self.backend.contains(namespace, key)
+
+    def put(self, namespace: str, key: str, value: str):
+        """Registra una inserción o actualización sin tocar el disco."""
+        with self._lock:
+            self._pending[(namespace, key)] = value
+            if len(self._pending) >= self.max_pending:
+                self._wakeup.set()
+
+    def put_many(self, namespace: str, items: Iterable[Tuple[str, str]]):
+        """Registra varias inserciones o actualizaciones."""
+        for key, value in items:
+            self.put(namespace, key, value)
+
+    def delete(self, namespace: str, key: str) -> bool:
+        """Registra una eliminación. Devuelve True si la clave existía."""
+        with self._lock:
+            existed = self.contains(namespace, key)
+            if existed:
+                self._pending[(namespace, key)] = None
+                if len(self._pending) >= self.max_pending:
+                    self._wakeup.set()
+        return existed
+
+    def clear(self, namespace: str) -> int:
+        """Elimina todas las filas de un espacio de nombres."""
+        with self._lock:
+            self.compact()
+            return self.backend.clear(namespace)
+
+    def count(self, namespace: str) -> int:
+        """Cuenta las filas de un espacio de nombres."""
+        with self._lock:
+            changes = self._changes(namespace)
+            total = self.backend.count(namespace)
+            for key, value in changes.items():
+                existed = self.backend.contains(namespace, key)
+                total += (value is not None) - existed
+        return total
+
+    def items(self, namespace: str, page_size: int = 1000) -> Iterator[Tuple[str, str]]:
+        """Recorre las filas combinando instantánea y cambios pendientes."""
+        with self._lock:
+            changes = self._changes(namespace)
+        for key, value in self.backend.items(namespace, page_size):
+            if key not in changes:
+                yield key, value
+        for key in sorted(changes):
+            if changes[key] is not None:
+                yield key, changes[key]
+
+    def keys(self, namespace: str, page_size: int = 1000) -> Iterator[str]:
+        """Recorre las claves de un espacio de nombres."""
+        for key, _ in self.items(namespace, page_size):
+            yield key
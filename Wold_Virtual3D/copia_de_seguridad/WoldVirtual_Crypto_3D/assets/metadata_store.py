@@ -0,0 +1,302 @@
+import os
+import json
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple, Union
+from .metadata_journal import WriteBehindStore
+
+# Ruta por defecto del almacén compartido por todos los gestores
+DEFAULT_METADATA_DB = Path(
+    os.getenv("WOLDVIRTUAL_METADATA_DB", str(Path("assets") / "metadata" / "metadata.db"))
+)
+
+class MetadataStore:
+    """Almacén transaccional de metadatos sobre SQLite en modo WAL."""
+
+    def __init__(self, db_path: Union[str, Path] = DEFAULT_METADATA_DB):
+        self.db_path = Path(db_path)
+        self.logger = logging.getLogger("MetadataStore")
+
+        # Crear directorio contenedor
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Conexión compartida entre hilos, protegida por un cerrojo
+        self._lock = threading.RLock()
+        self._batch_depth = 0
+        self._conn = sqlite3.connect(
+            str(self.db_path),
+            check_same_thread=False,
+            isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS metadata ("
+            "namespace TEXT NOT NULL, "
+            "key TEXT NOT NULL, "
+            "value TEXT NOT NULL, "
+            "PRIMARY KEY (namespace, key)"
+            ") WITHOUT ROWID"
+        )
+
+    @contextmanager
+    def batch(self):
+        """Agrupa varias escrituras en una única transacción."""
+        with self._lock:
+            if self._batch_depth == 0:
+                self._conn.execute("BEGIN")
+            self._batch_depth += 1
+            try:
+                yield self
+            except Exception:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self._conn.execute("ROLLBACK")
+                raise
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._conn.execute("COMMIT")
+
+    def get(self, namespace: str, key: str) -> Optional[str]:
+        """Obtiene el valor serializado de una clave."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM metadata WHERE namespace = ? AND key = ?",
+                (namespace, key)
+            ).fetchone()
+        return row[0] if row else None
+
+    def contains(self, namespace: str, key: str) -> bool:
+        """Verifica si existe una clave."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM metadata WHERE namespace = ? AND key = ?",
+                (namespace, key)
+            ).fetchone()
+        return row is not None
+
+    def put(self, namespace: str, key: str, value: str):
+        """Inserta o actualiza una fila."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO metadata (namespace, key, value) VALUES (?, ?, ?) "
+                "ON CONFLICT(namespace, key) DO UPDATE SET value = excluded.value",
+                (namespace, key, value)
+            )
+
+    def put_many(self, namespace: str, items: Iterable[Tuple[str, str]]):
+        """Inserta o actualiza varias filas en una sola transacción."""
+        with self.batch():
+            self._conn.executemany(
+                "INSERT INTO metadata (namespace, key, value) VALUES (?, ?, ?) "
+                "ON CONFLICT(namespace, key) DO UPDATE SET value = excluded.value",
+                ((namespace, key, value) for key, value in items)
+            )
+
+    def delete(self, namespace: str, key: str) -> bool:
+        """Elimina una fila. Devuelve True si existía."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM metadata WHERE namespace = ? AND key = ?",
+                (namespace, key)
+            )
+        return cursor.rowcount > 0
+
+    def clear(self, namespace: str) -> int:
+        """Elimina todas las filas de un espacio de nombres."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM metadata WHERE namespace = ?",
+                (namespace,)
+            )
+        return cursor.rowcount
+
+    def count(self, namespace: str) -> int:
+        """Cuenta las filas de un espacio de nombres."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM metadata WHERE namespace = ?",
+                (namespace,)
+            ).fetchone()
+        return row[0]
+
+    def items(self, namespace: str, page_size: int = 1000) -> Iterator[Tuple[str, str]]:
+        """Recorre las filas por páginas ordenadas por clave."""
+        last_key = ''
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT key, value FROM metadata "
+                    "WHERE namespace = ? AND key > ? ORDER BY key LIMIT ?",
+                    (namespace, last_key, page_size)
+                ).fetchall()
+            if not rows:
+                return
+            yield from rows
+            last_key = rows[-1][0]
+
+    def keys(self, namespace: str, page_size: int = 1000) -> Iterator[str]:
+        """Recorre las claves de un espacio de nombres."""
+        for key, _ in self.items(namespace, page_size):
+            yield key
+
+    def close(self):
+        """Cierra la conexión con la base de datos."""
+        with self._lock:
+            self._conn.close()
+
+class MetadataTable(MutableMapping):
+    """Vista tipo diccionario de un espacio de nombres del almacén.
+
+    Las filas se leen bajo demanda por clave y se decodifican con `factory`.
+    Los objetos obtenidos con `tabla[clave]` se rastrean para que `save()`
+    persista las mutaciones hechas sobre ellos; los obtenidos al iterar no,
+    por lo que deben reasignarse con `tabla[clave] = valor`.
+    """
+
+    def __init__(self,
+                 store: MetadataStore,
+                 namespace: str,
+                 factory: Callable[..., Any],
+                 cache_size: int = 4096):
+        self.store = store
+        self.namespace = namespace
+        self.factory = factory
+        self.cache_size = cache_size
+        self._live: "OrderedDict[str, Tuple[Any, str]]" = OrderedDict()
+
+    def _encode(self, value: Any) -> str:
+        """Serializa un objeto de metadatos."""
+        return json.dumps(vars(value))
+
+    def _decode(self, raw: str) -> Any:
+        """Reconstruye un objeto de metadatos."""
+        return self.factory(**json.loads(raw))
+
+    def _track(self, key: str, value: Any, raw: str):
+        """Registra un objeto vivo junto con su última versión persistida."""
+        self._live[key] = (value, raw)
+        self._live.move_to_end(key)
+        while len(self._live) > self.cache_size:
+            old_key, (old_value, old_raw) = self._live.popitem(last=False)
+            current = self._encode(old_value)
+            if current != old_raw:
+                self.store.put(self.namespace, old_key, current)
+
+    def __getitem__(self, key: str) -> Any:
+        entry = self._live.get(key)
+        if entry is not None:
+            self._live.move_to_end(key)
+            return entry[0]
+        raw = self.store.get(self.namespace, key)
+        if raw is None:
+            raise KeyError(key)
+        value = self._decode(raw)
+        self._track(key, value, raw)
+        return value
+
+    def __setitem__(self, key: str, value: Any):
+        raw = self._encode(value)
+        self.store.put(self.namespace, key, raw)
+        self._track(key, value, raw)
+
+    def __delitem__(self, key: str):
+        self._live.pop(key, None)
+        if not self.store.delete(self.namespace, key):
+            raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._live or self.store.contains(self.namespace, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return self.store.keys(self.namespace)
+
+    def __len__(self) -> int:
+        return self.store.count(self.namespace)
+
+    def values(self) -> Iterator[Any]:
+        """Recorre los objetos de metadatos de forma perezosa."""
+        for _, value in self.items():
+            yield value
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        """Recorre los pares clave/objeto de forma perezosa."""
+        for key, raw in self.store.items(self.namespace):
+            entry = self._live.get(key)
+            yield key, entry[0] if entry is not None else self._decode(raw)
+
+    def batch(self):
+        """Agrupa varias escrituras de la tabla en una única transacción."""
+        return self.store.batch()
+
+    def clear(self):
+        """Elimina todas las filas del espacio de nombres."""
+        self._live.clear()
+        self.store.clear(self.namespace)
+
+    def save(self, *keys: str):
+        """Persiste los objetos rastreados que hayan cambiado."""
+        targets = keys or list(self._live.keys())
+        with self.store.batch():
+            for key in targets:
+                entry = self._live.get(key)
+                if entry is None:
+                    continue
+                value, old_raw = entry
+                current = self._encode(value)
+                if current != old_raw:
+                    self.store.put(self.namespace, key, current)
+                    self._live[key] = (value, current)
+
+_stores: Dict[Path, Any] = {}
+_stores_lock = threading.Lock()
+
+def get_metadata_store(db_path: Union[str, Path] = DEFAULT_METADATA_DB,
+                       write_behind: bool = True,
+                       flush_interval: float = 1.0) -> Any:
+    """Obtiene el almacén compartido del proceso para una ruta dada.
+
+    Por defecto las escrituras pasan por un diario con volcado diferido,
+    de modo que las rutas calientes no escriben en disco de forma síncrona.
+    """
+    path = Path(db_path).resolve()
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = MetadataStore(path)
+            if write_behind:
+                store = WriteBehindStore(
+                    store,
+                    path.with_suffix('.journal'),
+                    flush_interval=flush_interval
+                )
+            _stores[path] = store
+        return store
+
+def open_metadata_table(metadata_file: Path,
+                        factory: Callable[..., Any],
+                        store: Optional[Any] = None) -> MetadataTable:
+    """Abre la tabla que sustituye a un archivo JSON de metadatos.
+
+    Si el archivo JSON heredado existe y la tabla está vacía, se importa
+    en una sola transacción y se renombra para no volver a importarlo.
+    """
+    store = store or get_metadata_store()
+    table = MetadataTable(store, metadata_file.as_posix(), factory)
+
+    if metadata_file.exists() and len(table) == 0:
+        with open(metadata_file, 'r') as f:
+            data = json.load(f)
+        store.put_many(
+            table.namespace,
+            ((k, json.dumps(v)) for k, v in data.items())
+        )
+        metadata_file.rename(metadata_file.with_name(metadata_file.name + '.migrated'))
+        store.logger.info(f"Metadatos migrados desde {metadata_file}: {len(data)} entradas")
+
+    return table
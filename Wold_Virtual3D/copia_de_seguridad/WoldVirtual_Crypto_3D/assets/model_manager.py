@@ -8,6 +8,8 @@ from dataclasses import dataclass
 import trimesh
 from trimesh.exchange.gltf import load_gltf, export_gltf
 import pygltflib
+from .metadata_store import MetadataStore, MetadataTable, open_metadata_table
+from .asset_watcher import AssetWatcher, WatchEvent
 
 # Configuración de logging
 logging.basicConfig(
@@ -31,37 +33,33 @@ class ModelMetadata:
 class ModelManager:
     """Gestor de modelos 3D."""
     
-    def __init__(self, base_path: str = "assets/models"):
+    def __init__(self,
+                 base_path: str = "assets/models",
+                 metadata_store: Optional[MetadataStore] = None):
         self.base_path = Path(base_path)
         self.metadata_path = self.base_path / "metadata"
         self.cache_path = self.base_path / "cache"
         self.logger = logging.getLogger("ModelManager")
+        self.metadata_store = metadata_store
         
         # Crear directorios necesarios
         self.metadata_path.mkdir(parents=True, exist_ok=True)
         self.cache_path.mkdir(parents=True, exist_ok=True)
         
         # Cargar metadatos existentes
-        self.metadata: Dict[str, ModelMetadata] = self._load_metadata()
+        self.metadata: MetadataTable = self._load_metadata()
         
-    def _load_metadata(self) -> Dict[str, ModelMetadata]:
-        """Carga los metadatos de modelos desde el archivo JSON."""
-        metadata_file = self.metadata_path / "models_metadata.json"
-        if metadata_file.exists():
-            with open(metadata_file, 'r') as f:
-                data = json.load(f)
-                return {k: ModelMetadata(**v) for k, v in data.items()}
-        return {}
+    def _load_metadata(self) -> MetadataTable:
+        """Abre la tabla de metadatos de modelos en el almacén compartido."""
+        return open_metadata_table(
+            self.metadata_path / "models_metadata.json",
+            ModelMetadata,
+            self.metadata_store
+        )
         
-    def _save_metadata(self):
-        """Guarda los metadatos de modelos en el archivo JSON."""
-        metadata_file = self.metadata_path / "models_metadata.json"
-        with open(metadata_file, 'w') as f:
-            json.dump(
-                {k: v.__dict__ for k, v in self.metadata.items()},
-                f,
-                indent=2
-            )
+    def _save_metadata(self, *keys: str):
+        """Persiste los metadatos de modelos modificados."""
+        self.metadata.save(*keys)
             
     def _get_model_info(self, file_path: Path) -> Optional[ModelMetadata]:
         """Obtiene información detallada de un modelo 3D."""
@@ -144,6 +142,39 @@ class ModelManager:
             self.logger.error(f"Error al registrar modelo {file_path}: {e}")
             return None
             
+    def watch(self,
+              debounce: float = 0.5,
+              poll_interval: float = 1.0,
+              use_inotify: bool = True) -> AssetWatcher:
+        """Inicia un observador que mantiene los metadatos de modelos sincronizados con el disco."""
+        watcher = AssetWatcher(
+            self.base_path,
+            self._apply_watch_events,
+            patterns=['*.glb', '*.gltf', '*.fbx', '*.obj', '*.stl'],
+            exclude=[self.metadata_path, self.cache_path],
+            debounce=debounce,
+            poll_interval=poll_interval,
+            metadata_store=self.metadata_store,
+            use_inotify=use_inotify
+        )
+        return watcher.start()
+        
+    def _apply_watch_events(self, events: List[WatchEvent]):
+        """Aplica los cambios detectados por el observador sin reprocesar renombrados."""
+        for event in events:
+            if event.kind == 'moved':
+                metadata = self.metadata.pop(event.old_path.stem, None)
+                if metadata is None:
+                    self.register_model(event.path)
+                    continue
+                self.metadata[event.path.stem] = metadata
+                self.logger.info(f"Modelo renombrado: {event.old_path} -> {event.path}")
+            elif event.kind == 'deleted':
+                if self.metadata.pop(event.path.stem, None) is not None:
+                    self.logger.info(f"Modelo eliminado: {event.path}")
+            else:
+                self.register_model(event.path)
+                
     def optimize_model(self, file_path: Union[str, Path], target_vertices: int = 10000) -> bool:
         """Optimiza un modelo 3D reduciendo su complejidad."""
         try:
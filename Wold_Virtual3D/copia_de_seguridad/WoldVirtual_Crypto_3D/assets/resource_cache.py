@@ -0,0 +1,169 @@
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Any, Callable, Iterator, List, Optional, Set, Tuple
+
+# Bytes por banda según el modo de imagen de PIL
+_MODE_BAND_BYTES = {'I': 4, 'F': 4, 'I;16': 2, 'I;16B': 2, 'I;16L': 2}
+
+def _image_size(image: Any) -> int:
+    """Tamaño en memoria de una imagen PIL una vez decodificada."""
+    width, height = image.size
+    band_bytes = _MODE_BAND_BYTES.get(image.mode, 1)
+    return width * height * len(image.getbands()) * band_bytes
+
+def _sound_size(sound: Any) -> int:
+    """Tamaño del búfer de muestras de un pygame.mixer.Sound."""
+    import pygame
+    frequency, sample_format, channels = pygame.mixer.get_init()
+    return int(sound.get_length() * frequency * channels * abs(sample_format) // 8)
+
+def _object_size(obj: Any) -> int:
+    """Tamaño aproximado de un objeto anidado (p. ej. JSON parseado)."""
+    total = 0
+    seen: Set[int] = set()
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        total += sys.getsizeof(current)
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+    return total
+
+def estimate_resource_size(resource: Any) -> int:
+    """Estima los bytes que ocupa un recurso cargado en memoria."""
+    try:
+        if hasattr(resource, 'getbands') and hasattr(resource, 'size'):
+            return _image_size(resource)
+        if hasattr(resource, 'get_length') and hasattr(resource, 'get_num_channels'):
+            return _sound_size(resource)
+        if hasattr(resource, 'nbytes'):
+            return int(resource.nbytes)
+        if isinstance(resource, (bytes, bytearray, memoryview, str)):
+            return sys.getsizeof(resource)
+        return _object_size(resource)
+    except Exception:
+        return sys.getsizeof(resource)
+
+class ResourceCache(MutableMapping):
+    """Recursos cargados con presupuesto de memoria y expulsión LRU.
+
+    Cada recurso se contabiliza con `estimator`; al superar `max_memory`
+    se expulsan los usados hace más tiempo, salvo los anclados y el recién
+    insertado. `on_evict` recibe el nombre de cada recurso expulsado.
+    """
+
+    def __init__(self,
+                 max_memory: Optional[int] = None,
+                 on_evict: Optional[Callable[[str], None]] = None,
+                 estimator: Callable[[Any], int] = estimate_resource_size):
+        self.max_memory = max_memory
+        self.on_evict = on_evict
+        self.estimator = estimator
+        self.memory_used = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.evicted_bytes = 0
+        self._entries: 'OrderedDict[str, Tuple[Any, int]]' = OrderedDict()
+        self._pinned: Set[str] = set()
+        self._lock = threading.RLock()
+
+    def __getitem__(self, name: str) -> Any:
+        with self._lock:
+            try:
+                resource, _ = self._entries[name]
+            except KeyError:
+                self.misses += 1
+                raise
+            self._entries.move_to_end(name)
+            self.hits += 1
+            return resource
+
+    def __setitem__(self, name: str, resource: Any):
+        size = self.estimator(resource)
+        with self._lock:
+            previous = self._entries.pop(name, None)
+            if previous is not None:
+                self.memory_used -= previous[1]
+            self._entries[name] = (resource, size)
+            self.memory_used += size
+            evicted = self._enforce_budget(protect=name)
+        self._notify(evicted)
+
+    def __delitem__(self, name: str):
+        with self._lock:
+            _, size = self._entries.pop(name)
+            self.memory_used -= size
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._entries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._entries))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def size_of(self, name: str) -> int:
+        """Bytes contabilizados para un recurso cargado."""
+        entry = self._entries.get(name)
+        return entry[1] if entry else 0
+
+    def pin(self, name: str):
+        """Ancla un recurso para que nunca se expulse."""
+        with self._lock:
+            self._pinned.add(name)
+
+    def unpin(self, name: str):
+        """Desancla un recurso y reaplica el presupuesto."""
+        with self._lock:
+            self._pinned.discard(name)
+            evicted = self._enforce_budget()
+        self._notify(evicted)
+
+    def is_pinned(self, name: str) -> bool:
+        """Indica si un recurso está anclado."""
+        return name in self._pinned
+
+    @property
+    def pinned(self) -> Set[str]:
+        """Nombres de los recursos anclados."""
+        return set(self._pinned)
+
+    def set_max_memory(self, max_memory: Optional[int]):
+        """Cambia el presupuesto de memoria y expulsa lo que sobre."""
+        with self._lock:
+            self.max_memory = max_memory
+            evicted = self._enforce_budget()
+        self._notify(evicted)
+
+    def _enforce_budget(self, protect: Optional[str] = None) -> List[str]:
+        """Expulsa recursos LRU hasta respetar el presupuesto."""
+        evicted: List[str] = []
+        if self.max_memory is None or self.memory_used <= self.max_memory:
+            return evicted
+        for name in list(self._entries):
+            if self.memory_used <= self.max_memory:
+                break
+            if name == protect or name in self._pinned:
+                continue
+            _, size = self._entries.pop(name)
+            self.memory_used -= size
+            self.evictions += 1
+            self.evicted_bytes += size
+            evicted.append(name)
+        return evicted
+
+    def _notify(self, evicted: List[str]):
+        """Avisa de las expulsiones fuera del cerrojo."""
+        if self.on_evict:
+            for name in evicted:
+                self.on_evict(name)
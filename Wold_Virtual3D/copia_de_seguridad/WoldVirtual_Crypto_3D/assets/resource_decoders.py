@@ -0,0 +1,195 @@
+import os
+import json
+import mmap
+import logging
+import importlib
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Set, Union
+from .hashing import MMAP_THRESHOLD
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Grupo de entry points para decodificadores de terceros
+DECODER_ENTRY_POINT_GROUP = 'woldvirtual.decoders'
+
+Decoder = Callable[[str], Any]
+
+class LazyDecoder:
+    """Decodificador cuya implementación se importa en la primera llamada.
+
+    `target` es una ruta 'modulo:atributo' o una función sin argumentos que
+    devuelve el decodificador real.
+    """
+
+    def __init__(self, target: Union[str, Callable[[], Decoder]]):
+        self.target = target
+        self._decoder: Optional[Decoder] = None
+        self._lock = threading.Lock()
+
+    def resolve(self) -> Decoder:
+        """Importa (una sola vez) y devuelve el decodificador real."""
+        if self._decoder is None:
+            with self._lock:
+                if self._decoder is None:
+                    if isinstance(self.target, str):
+                        module_name, _, attr = self.target.partition(':')
+                        self._decoder = getattr(importlib.import_module(module_name), attr)
+                    else:
+                        self._decoder = self.target()
+        return self._decoder
+
+    def __call__(self, path: str) -> Any:
+        return self.resolve()(path)
+
+def read_mapped(path: Union[str, Path]) -> memoryview:
+    """Expone el contenido de un archivo como memoryview de solo lectura sin copiarlo."""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return memoryview(b'')
+        # El mapeo sigue vivo mientras exista la vista
+        return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+def decode_json(path: str) -> Any:
+    """Decodifica JSON con orjson si está instalado y mmap para archivos grandes."""
+    size = os.path.getsize(path)
+    if orjson is not None:
+        if size >= MMAP_THRESHOLD:
+            view = read_mapped(path)
+            try:
+                return orjson.loads(view)
+            finally:
+                view.release()
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'rb') as f:
+        if size >= MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return json.loads(mm.read())
+        return json.loads(f.read())
+
+def decode_text(path: str) -> str:
+    """Lee un archivo de texto."""
+    with open(path, 'r') as f:
+        return f.read()
+
+def decode_binary(path: str) -> memoryview:
+    """Devuelve un binario como memoryview sin copias."""
+    return read_mapped(path)
+
+def _pil_decoder() -> Decoder:
+    """Importa PIL y devuelve el decodificador de imágenes."""
+    from PIL import Image
+    return Image.open
+
+def _pygame_decoder() -> Decoder:
+    """Importa pygame, inicializa el mezclador una vez y devuelve el decodificador de sonido."""
+    import pygame
+    if not pygame.mixer.get_init():
+        pygame.mixer.init()
+    return pygame.mixer.Sound
+
+class DecoderRegistry:
+    """Registro de decodificadores de recursos por tipo (extensión).
+
+    Los decodificadores de terceros pueden registrarse con `register` o
+    publicarse como entry points del grupo `woldvirtual.decoders` (nombre =
+    tipo, valor = 'modulo:funcion'); estos se cargan de forma perezosa.
+    """
+
+    def __init__(self, load_entry_points: bool = True):
+        self.logger = logging.getLogger("DecoderRegistry")
+        self._decoders: Dict[str, Decoder] = {}
+        self._explicit: Set[str] = set()
+        self._entry_points_loaded = not load_entry_points
+        self._lock = threading.Lock()
+
+    def register(self,
+                 types: Union[str, Iterable[str]],
+                 decoder: Union[Decoder, str],
+                 lazy: bool = False):
+        """Registra un decodificador para uno o varios tipos.
+
+        Una cadena 'modulo:funcion' o `lazy=True` (función que devuelve el
+        decodificador) difiere la importación hasta el primer uso.
+        """
+        if isinstance(decoder, str) or lazy:
+            decoder = LazyDecoder(decoder)
+        for resource_type in ([types] if isinstance(types, str) else types):
+            resource_type = resource_type.lower().lstrip('.')
+            with self._lock:
+                self._decoders[resource_type] = decoder
+                self._explicit.add(resource_type)
+
+    def unregister(self, resource_type: str):
+        """Elimina el decodificador de un tipo."""
+        with self._lock:
+            self._decoders.pop(resource_type.lower(), None)
+            self._explicit.discard(resource_type.lower())
+
+    def _register_builtin(self, types: Iterable[str], decoder: Decoder):
+        """Registra un decodificador incluido que los terceros pueden sustituir."""
+        for resource_type in types:
+            self._decoders[resource_type] = decoder
+
+    def _load_entry_points(self):
+        """Registra los decodificadores publicados como entry points."""
+        with self._lock:
+            if self._entry_points_loaded:
+                return
+            self._entry_points_loaded = True
+            try:
+                from importlib.metadata import entry_points
+                found = entry_points()
+                if hasattr(found, 'select'):
+                    found = found.select(group=DECODER_ENTRY_POINT_GROUP)
+                else:
+                    found = found.get(DECODER_ENTRY_POINT_GROUP, [])
+            except Exception as e:
+                self.logger.error(f"Error al leer entry points de decodificadores: {e}")
+                return
+            for entry_point in found:
+                resource_type = entry_point.name.lower()
+                if resource_type not in self._explicit:
+                    self._decoders[resource_type] = LazyDecoder(entry_point.load)
+
+    def get(self, resource_type: str) -> Optional[Decoder]:
+        """Obtiene el decodificador de un tipo, o None si no hay ninguno."""
+        if not self._entry_points_loaded:
+            self._load_entry_points()
+        return self._decoders.get(resource_type.lower())
+
+    def types(self) -> Set[str]:
+        """Tipos con decodificador registrado."""
+        if not self._entry_points_loaded:
+            self._load_entry_points()
+        return set(self._decoders)
+
+    def decode(self, resource_type: str, path: Union[str, Path]) -> Optional[Any]:
+        """Decodifica un archivo con el decodificador de su tipo."""
+        decoder = self.get(resource_type)
+        if decoder is None:
+            return None
+        return decoder(str(path))
+
+def create_default_registry(load_entry_points: bool = True) -> DecoderRegistry:
+    """Crea un registro con los decodificadores incluidos."""
+    registry = DecoderRegistry(load_entry_points)
+    registry._register_builtin(['json'], decode_json)
+    registry._register_builtin(['txt'], decode_text)
+    registry._register_builtin(['bin'], decode_binary)
+    registry._register_builtin(['png', 'jpg', 'jpeg'], LazyDecoder(_pil_decoder))
+    registry._register_builtin(['mp3', 'wav', 'ogg'], LazyDecoder(_pygame_decoder))
+    return registry
+
+# Registro compartido por defecto
+default_registry = create_default_registry()
+
+def register_decoder(types: Union[str, Iterable[str]],
+                     decoder: Union[Decoder, str],
+                     lazy: bool = False):
+    """Registra un decodificador en el registro compartido."""
+    default_registry.register(types, decoder, lazy)
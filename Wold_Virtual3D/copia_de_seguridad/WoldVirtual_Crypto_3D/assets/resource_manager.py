@@ -1,11 +1,19 @@
 import os
 import json
 import logging
-import hashlib
+import threading
 from pathlib import Path
-from typing import Dict, List, Optional, Union, Any
+from typing import Callable, Dict, Iterable, List, Optional, Union, Any
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
+from .metadata_store import MetadataStore, MetadataTable, open_metadata_table
+from .hashing import get_hashing_service
+from .integrity_validator import IntegrityValidator
+from .resource_cache import ResourceCache
+from .resource_decoders import DecoderRegistry, default_registry
+from .dependency_graph import DependencyGraph
+from .dependency_scheduler import NodeResult, PlanResult, build_plan, execute_plan
 
 # Configuración de logging
 logging.basicConfig(
@@ -34,11 +42,21 @@ class ResourceMetadata:
 class ResourceManager:
     """Gestor de recursos."""
     
-    def __init__(self, base_path: str = "assets/resources"):
+    def __init__(self,
+                 base_path: str = "assets/resources",
+                 metadata_store: Optional[MetadataStore] = None,
+                 max_memory: Optional[int] = None,
+                 pin_shared: bool = True,
+                 max_workers: int = 4,
+                 decoders: Optional[DecoderRegistry] = None):
         self.base_path = Path(base_path)
         self.metadata_path = self.base_path / "metadata"
         self.cache_path = self.base_path / "cache"
         self.logger = logging.getLogger("ResourceManager")
+        self.metadata_store = metadata_store
+        self.hasher = get_hashing_service(metadata_store)
+        self.pin_shared = pin_shared
+        self.decoders = decoders or default_registry
         
         # Crear directorios necesarios
         self.base_path.mkdir(parents=True, exist_ok=True)
@@ -46,38 +64,36 @@ class ResourceManager:
         self.cache_path.mkdir(parents=True, exist_ok=True)
         
         # Cargar metadatos existentes
-        self.metadata: Dict[str, ResourceMetadata] = self._load_metadata()
+        self.metadata: MetadataTable = self._load_metadata()
         
-        # Recursos cargados
-        self.loaded_resources: Dict[str, Any] = {}
+        # Recursos cargados, con presupuesto de memoria y expulsión LRU
+        self.loaded_resources = ResourceCache(max_memory, on_evict=self._on_resource_evicted)
         
-    def _load_metadata(self) -> Dict[str, ResourceMetadata]:
-        """Carga los metadatos de recursos desde el archivo JSON."""
-        metadata_file = self.metadata_path / "resources_metadata.json"
-        if metadata_file.exists():
-            with open(metadata_file, 'r') as f:
-                data = json.load(f)
-                return {k: ResourceMetadata(**v) for k, v in data.items()}
-        return {}
+        # Pool de hilos para cargas asíncronas y cargas en vuelo por nombre
+        self.max_workers = max_workers
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.RLock()
         
-    def _save_metadata(self):
-        """Guarda los metadatos de recursos en el archivo JSON."""
-        metadata_file = self.metadata_path / "resources_metadata.json"
-        with open(metadata_file, 'w') as f:
-            json.dump(
-                {k: v.__dict__ for k, v in self.metadata.items()},
-                f,
-                indent=2
-            )
+        # Validador incremental de integridad
+        self.validator = IntegrityValidator(self.metadata_path, metadata_store)
+        
+    def _load_metadata(self) -> MetadataTable:
+        """Abre la tabla de metadatos de recursos en el almacén compartido."""
+        return open_metadata_table(
+            self.metadata_path / "resources_metadata.json",
+            ResourceMetadata,
+            self.metadata_store
+        )
+        
+    def _save_metadata(self, *keys: str):
+        """Persiste los metadatos de recursos modificados."""
+        self.metadata.save(*keys)
             
     def _calculate_hash(self, file_path: Path) -> str:
-        """Calcula el hash de un archivo."""
+        """Calcula el hash de un archivo mediante el servicio compartido."""
         try:
-            hasher = hashlib.sha256()
-            with open(file_path, 'rb') as f:
-                for chunk in iter(lambda: f.read(4096), b''):
-                    hasher.update(chunk)
-            return hasher.hexdigest()
+            return self.hasher.hash_file(file_path)
         except Exception as e:
             self.logger.error(f"Error al calcular hash de {file_path}: {e}")
             return ''
@@ -160,34 +176,25 @@ class ResourceManager:
             metadata = self.metadata[name]
             
             # Verificar si ya está cargado
-            if not force_reload and metadata.is_loaded and name in self.loaded_resources:
-                return self.loaded_resources[name]
+            if not force_reload and metadata.is_loaded:
+                resource = self.loaded_resources.get(name)
+                if resource is not None:
+                    return resource
                 
-            # Cargar recurso según su tipo
-            resource = None
-            if metadata.type == 'json':
-                with open(metadata.path, 'r') as f:
-                    resource = json.load(f)
-            elif metadata.type == 'txt':
-                with open(metadata.path, 'r') as f:
-                    resource = f.read()
-            elif metadata.type == 'png':
-                from PIL import Image
-                resource = Image.open(metadata.path)
-            elif metadata.type == 'mp3':
-                import pygame
-                pygame.mixer.init()
-                resource = pygame.mixer.Sound(metadata.path)
-            # Añadir más tipos según sea necesario
+            # Cargar recurso con el decodificador registrado para su tipo
+            resource = self.decoders.decode(metadata.type, metadata.path)
             
             if resource is not None:
-                # Actualizar metadatos
-                metadata.is_loaded = True
-                metadata.last_modified = datetime.now().isoformat()
-                self._save_metadata()
-                
-                # Guardar en caché
-                self.loaded_resources[name] = resource
+                with self._lock:
+                    # Actualizar metadatos
+                    metadata.is_loaded = True
+                    metadata.last_modified = datetime.now().isoformat()
+                    self._save_metadata(name)
+                    
+                    # Guardar en caché (los compartidos quedan anclados)
+                    if self.pin_shared and metadata.is_shared:
+                        self.loaded_resources.pin(name)
+                    self.loaded_resources[name] = resource
                 
             return resource
             
@@ -195,6 +202,93 @@ class ResourceManager:
             self.logger.error(f"Error al cargar recurso {name}: {e}")
             return None
             
+    def _dependency_closure(self, names: Iterable[str]) -> List[str]:
+        """Cierre de dependencias de los recursos dados, dependencias primero."""
+        order: List[str] = []
+        visited = set()
+        for root in names:
+            if root in visited:
+                continue
+            visited.add(root)
+            stack = [(root, iter(self._dependencies_of(root)))]
+            while stack:
+                name, children = stack[-1]
+                child = next(children, None)
+                if child is None:
+                    stack.pop()
+                    order.append(name)
+                elif child not in visited:
+                    visited.add(child)
+                    stack.append((child, iter(self._dependencies_of(child))))
+        return order
+        
+    def _dependencies_of(self, name: str) -> List[str]:
+        """Dependencias registradas de un recurso."""
+        metadata = self.metadata.get(name)
+        return list(metadata.dependencies) if metadata is not None else []
+        
+    def load_resource_async(self,
+                            name: str,
+                            force_reload: bool = False) -> Future:
+        """Carga un recurso en el pool de hilos; las peticiones repetidas comparten futuro."""
+        with self._lock:
+            future = self._inflight.get(name)
+            if future is not None:
+                return future
+                
+            if not force_reload:
+                resource = self.loaded_resources.get(name)
+                if resource is not None:
+                    future = Future()
+                    future.set_result(resource)
+                    return future
+                    
+            future = self.executor.submit(self.load_resource, name, force_reload)
+            self._inflight[name] = future
+            
+        future.add_done_callback(lambda _: self._forget_inflight(name, future))
+        return future
+        
+    def _forget_inflight(self, name: str, future: Future):
+        """Olvida una carga en vuelo que ya terminó."""
+        with self._lock:
+            if self._inflight.get(name) is future:
+                del self._inflight[name]
+                
+    def prefetch(self, names: Iterable[str]) -> Dict[str, Future]:
+        """Carga en paralelo los recursos dados y todo su cierre de dependencias.
+        
+        Las dependencias se encolan antes que quienes dependen de ellas y las
+        cargas ya en vuelo se reutilizan. Devuelve un futuro por recurso.
+        """
+        return {
+            name: self.load_resource_async(name)
+            for name in self._dependency_closure(names)
+            if name in self.metadata
+        }
+        
+    def load_scene(self,
+                   names: Iterable[str],
+                   cancel_event: Optional[threading.Event] = None,
+                   progress: Optional[Callable[[NodeResult], None]] = None) -> PlanResult:
+        """Carga unos recursos y sus dependencias por niveles topológicos en paralelo.
+        
+        Cada recurso empieza en cuanto terminan sus dependencias; si una falla,
+        sus dependientes se omiten.
+        """
+        names = list(names)
+        graph = DependencyGraph()
+        for name in self._dependency_closure(names):
+            if name not in self.metadata:
+                continue
+            graph.add_node(name)
+            for dep in self._dependencies_of(name):
+                if dep in self.metadata:
+                    graph.add_edge(name, dep)
+        plan = build_plan(graph, names)
+        return execute_plan(plan, self.load_resource, self.max_workers,
+                            cancel_event, progress, self.executor)
+        
     def unload_resource(self, name: str) -> bool:
         """Descarga un recurso."""
         try:
@@ -216,6 +310,31 @@ class ResourceManager:
             self.logger.error(f"Error al descargar recurso {name}: {e}")
             return False
             
+    def _on_resource_evicted(self, name: str):
+        """Marca como descargado un recurso expulsado por el presupuesto de memoria."""
+        try:
+            metadata = self.metadata.get(name)
+            if metadata is not None:
+                metadata.is_loaded = False
+                self._save_metadata(name)
+            self.logger.info(f"Recurso expulsado de memoria: {name}")
+        except Exception as e:
+            self.logger.error(f"Error al expulsar recurso {name}: {e}")
+            
+    def pin_resource(self, name: str) -> bool:
+        """Ancla un recurso para que el presupuesto de memoria no lo expulse."""
+        if name not in self.metadata:
+            return False
+        self.loaded_resources.pin(name)
+        return True
+        
+    def unpin_resource(self, name: str) -> bool:
+        """Desancla un recurso, que vuelve a ser expulsable."""
+        if name not in self.metadata:
+            return False
+        self.loaded_resources.unpin(name)
+        return True
+        
     def get_resource(self,
                     name: str,
                     default: Optional[Any] = None) -> Optional[Any]:
@@ -225,10 +344,11 @@ class ResourceManager:
                 return default
                 
             # Intentar cargar si no está en caché
-            if name not in self.loaded_resources:
+            resource = self.loaded_resources.get(name)
+            if resource is None:
                 return self.load_resource(name)
                 
-            return self.loaded_resources[name]
+            return resource
             
         except Exception as e:
             self.logger.error(f"Error al obtener recurso {name}: {e}")
@@ -278,15 +398,10 @@ class ResourceManager:
                 
             metadata = self.metadata[name]
             
-            # Verificar archivo
-            file_path = Path(metadata.path)
-            has_file = file_path.exists()
-            
-            # Verificar hash
-            has_valid_hash = False
-            if has_file:
-                current_hash = self._calculate_hash(file_path)
-                has_valid_hash = current_hash == metadata.hash
+            # Verificar archivo y hash (solo se rehashea si cambió su huella)
+            status = self.validator.check(name, metadata.path, metadata.hash)
+            has_file = status != 'missing'
+            has_valid_hash = status == 'valid'
                 
             return {
                 'exists': True,
@@ -310,6 +425,13 @@ class ResourceManager:
             'loaded_resources': 0,
             'cached_resources': 0,
             'shared_resources': 0,
+            'pinned_resources': len(self.loaded_resources.pinned),
+            'memory_used': self.loaded_resources.memory_used,
+            'memory_budget': self.loaded_resources.max_memory,
+            'memory_hits': self.loaded_resources.hits,
+            'memory_misses': self.loaded_resources.misses,
+            'evictions': self.loaded_resources.evictions,
+            'evicted_bytes': self.loaded_resources.evicted_bytes,
             'types': {},
             'dependency_counts': {
                 '0': 0,
@@ -357,4 +479,8 @@ class ResourceManager:
             else:
                 stats['parameter_counts']['10+'] += 1
                 
-        return stats 
\ No newline at end of file
+        return stats
+        
+    def __del__(self):
+        """Limpieza al destruir el objeto."""
+        self.executor.shutdown(wait=False)
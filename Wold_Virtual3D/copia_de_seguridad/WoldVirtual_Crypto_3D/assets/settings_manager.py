@@ -5,6 +5,7 @@ from pathlib import Path
 from typing import Dict, List, Optional, Union, Any
 from dataclasses import dataclass
 from datetime import datetime
+from .metadata_store import MetadataStore, MetadataTable, open_metadata_table
 
 # Configuración de logging
 logging.basicConfig(
@@ -33,11 +34,14 @@ class SettingMetadata:
 class SettingsManager:
     """Gestor de configuraciones."""
     
-    def __init__(self, base_path: str = "assets/settings"):
+    def __init__(self,
+                 base_path: str = "assets/settings",
+                 metadata_store: Optional[MetadataStore] = None):
         self.base_path = Path(base_path)
         self.metadata_path = self.base_path / "metadata"
         self.data_path = self.base_path / "data"
         self.logger = logging.getLogger("SettingsManager")
+        self.metadata_store = metadata_store
         
         # Crear directorios necesarios
         self.base_path.mkdir(parents=True, exist_ok=True)
@@ -45,26 +49,19 @@ class SettingsManager:
         self.data_path.mkdir(parents=True, exist_ok=True)
         
         # Cargar metadatos existentes
-        self.metadata: Dict[str, SettingMetadata] = self._load_metadata()
+        self.metadata: MetadataTable = self._load_metadata()
         
-    def _load_metadata(self) -> Dict[str, SettingMetadata]:
-        """Carga los metadatos de configuraciones desde el archivo JSON."""
-        metadata_file = self.metadata_path / "settings_metadata.json"
-        if metadata_file.exists():
-            with open(metadata_file, 'r') as f:
-                data = json.load(f)
-                return {k: SettingMetadata(**v) for k, v in data.items()}
-        return {}
+    def _load_metadata(self) -> MetadataTable:
+        """Abre la tabla de metadatos de configuraciones en el almacén compartido."""
+        return open_metadata_table(
+            self.metadata_path / "settings_metadata.json",
+            SettingMetadata,
+            self.metadata_store
+        )
         
-    def _save_metadata(self):
-        """Guarda los metadatos de configuraciones en el archivo JSON."""
-        metadata_file = self.metadata_path / "settings_metadata.json"
-        with open(metadata_file, 'w') as f:
-            json.dump(
-                {k: v.__dict__ for k, v in self.metadata.items()},
-                f,
-                indent=2
-            )
+    def _save_metadata(self, *keys: str):
+        """Persiste los metadatos de configuraciones modificados."""
+        self.metadata.save(*keys)
             
     def _validate_value(self,
                        value: Any,
@@ -7,6 +7,8 @@ import numpy as np
 from PIL import Image
 import cv2
 from dataclasses import dataclass
+from .metadata_store import MetadataStore, MetadataTable, open_metadata_table
+from .asset_watcher import AssetWatcher, WatchEvent
 
 # Configuración de logging
 logging.basicConfig(
@@ -30,37 +32,33 @@ class TextureMetadata:
 class TextureManager:
     """Gestor de texturas."""
     
-    def __init__(self, base_path: str = "assets/textures"):
+    def __init__(self,
+                 base_path: str = "assets/textures",
+                 metadata_store: Optional[MetadataStore] = None):
         self.base_path = Path(base_path)
         self.metadata_path = self.base_path / "metadata"
         self.cache_path = self.base_path / "cache"
         self.logger = logging.getLogger("TextureManager")
+        self.metadata_store = metadata_store
         
         # Crear directorios necesarios
         self.metadata_path.mkdir(parents=True, exist_ok=True)
         self.cache_path.mkdir(parents=True, exist_ok=True)
         
         # Cargar metadatos existentes
-        self.metadata: Dict[str, TextureMetadata] = self._load_metadata()
+        self.metadata: MetadataTable = self._load_metadata()
         
-    def _load_metadata(self) -> Dict[str, TextureMetadata]:
-        """Carga los metadatos de texturas desde el archivo JSON."""
-        metadata_file = self.metadata_path / "textures_metadata.json"
-        if metadata_file.exists():
-            with open(metadata_file, 'r') as f:
-                data = json.load(f)
-                return {k: TextureMetadata(**v) for k, v in data.items()}
-        return {}
+    def _load_metadata(self) -> MetadataTable:
+        """Abre la tabla de metadatos de texturas en el almacén compartido."""
+        return open_metadata_table(
+            self.metadata_path / "textures_metadata.json",
+            TextureMetadata,
+            self.metadata_store
+        )
         
-    def _save_metadata(self):
-        """Guarda los metadatos de texturas en el archivo JSON."""
-        metadata_file = self.metadata_path / "textures_metadata.json"
-        with open(metadata_file, 'w') as f:
-            json.dump(
-                {k: v.__dict__ for k, v in self.metadata.items()},
-                f,
-                indent=2
-            )
+    def _save_metadata(self, *keys: str):
+        """Persiste los metadatos de texturas modificados."""
+        self.metadata.save(*keys)
             
     def _get_texture_info(self, file_path: Path) -> Optional[TextureMetadata]:
         """Obtiene información detallada de una textura."""
@@ -125,6 +123,39 @@ class TextureManager:
             self.logger.error(f"Error al registrar textura {file_path}: {e}")
             return None
             
+    def watch(self,
+              debounce: float = 0.5,
+              poll_interval: float = 1.0,
+              use_inotify: bool = True) -> AssetWatcher:
+        """Inicia un observador que mantiene los metadatos de texturas sincronizados con el disco."""
+        watcher = AssetWatcher(
+            self.base_path,
+            self._apply_watch_events,
+            patterns=['*.png', '*.jpg', '*.jpeg', '*.tga', '*.bmp', '*.hdr', '*.exr'],
+            exclude=[self.metadata_path, self.cache_path],
+            debounce=debounce,
+            poll_interval=poll_interval,
+            metadata_store=self.metadata_store,
+            use_inotify=use_inotify
+        )
+        return watcher.start()
+        
+    def _apply_watch_events(self, events: List[WatchEvent]):
+        """Aplica los cambios detectados por el observador sin reprocesar renombrados."""
+        for event in events:
+            if event.kind == 'moved':
+                metadata = self.metadata.pop(event.old_path.stem, None)
+                if metadata is None:
+                    self.register_texture(event.path)
+                    continue
+                self.metadata[event.path.stem] = metadata
+                self.logger.info(f"Textura renombrada: {event.old_path} -> {event.path}")
+            elif event.kind == 'deleted':
+                if self.metadata.pop(event.path.stem, None) is not None:
+                    self.logger.info(f"Textura eliminada: {event.path}")
+            else:
+                self.register_texture(event.path)
+                
     def generate_mipmaps(self, file_path: Union[str, Path], levels: int = 4) -> bool:
         """Genera mipmaps para una textura."""
         try:
@@ -5,6 +5,7 @@ from pathlib import Path
 from typing import Dict, List, Optional, Union, Tuple
 from dataclasses import dataclass
 from datetime import datetime
+from .metadata_store import MetadataStore, MetadataTable, open_metadata_table
 
 # Configuración de logging
 logging.basicConfig(
@@ -31,35 +32,31 @@ class VersionMetadata:
 class VersionManager:
     """Gestor de versiones."""
     
-    def __init__(self, base_path: str = "assets/versions"):
+    def __init__(self,
+                 base_path: str = "assets/versions",
+                 metadata_store: Optional[MetadataStore] = None):
         self.base_path = Path(base_path)
         self.metadata_path = self.base_path / "metadata"
         self.logger = logging.getLogger("VersionManager")
+        self.metadata_store = metadata_store
         
         # Crear directorios necesarios
         self.metadata_path.mkdir(parents=True, exist_ok=True)
         
         # Cargar metadatos existentes
-        self.metadata: Dict[str, VersionMetadata] = self._load_metadata()
+        self.metadata: MetadataTable = self._load_metadata()
         
-    def _load_metadata(self) -> Dict[str, VersionMetadata]:
-        """Carga los metadatos de versiones desde el archivo JSON."""
-        metadata_file = self.metadata_path / "versions_metadata.json"
-        if metadata_file.exists():
-            with open(metadata_file, 'r') as f:
-                data = json.load(f)
-                return {k: VersionMetadata(**v) for k, v in data.items()}
-        return {}
+    def _load_metadata(self) -> MetadataTable:
+        """Abre la tabla de metadatos de versiones en el almacén compartido."""
+        return open_metadata_table(
+            self.metadata_path / "versions_metadata.json",
+            VersionMetadata,
+            self.metadata_store
+        )
         
-    def _save_metadata(self):
-        """Guarda los metadatos de versiones en el archivo JSON."""
-        metadata_file = self.metadata_path / "versions_metadata.json"
-        with open(metadata_file, 'w') as f:
-            json.dump(
-                {k: v.__dict__ for k, v in self.metadata.items()},
-                f,
-                indent=2
-            )
+    def _save_metadata(self, *keys: str):
+        """Persiste los metadatos de versiones modificados."""
+        self.metadata.save(*keys)
             
     def _parse_version(self, version: str) -> Tuple[int, int, int]:
         """Parsea una versión en formato semántico."""
@@ -468,9 +468,15 @@ def generate_file_hash(file_path: str, algorithm: str = "sha256") -> str:
     hash_obj = hashlib.new(algorithm)
     
     try:
-        with open(file_path, 'rb') as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_obj.update(chunk)
+        # Lecturas de 1 MB sobre un búfer reutilizable
+        buffer = bytearray(1024 * 1024)
+        view = memoryview(buffer)
+        with open(file_path, 'rb', buffering=0) as f:
+            while True:
+                n = f.readinto(buffer)
+                if not n:
+                    break
+                hash_obj.update(view[:n])
         return hash_obj.hexdigest()
     except FileNotFoundError:
         logger.error(f"Archivo no encontrado: {file_path}")